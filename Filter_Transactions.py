@@ -1,11 +1,19 @@
 import pandas as pd
+from instrumentation import traced
 
-df_sms = pd.read_csv('sms_raw_dump.csv')
+TRANSACTION_PATTERN = r'\b(debited|credited|Sent)\b'
 
-df_transactions = df_sms[df_sms['body'].str.contains(r'\b(debited|credited|Sent)\b', case=True, na=False)]
+@traced("filter")
+def filter_transactions(df_sms):
+    """Keep only the SMS bodies that mention a debit, credit or transfer."""
+    df_transactions = df_sms[df_sms['body'].str.contains(TRANSACTION_PATTERN, case=True, na=False)]
+    return df_transactions.reset_index(drop=True)
 
-df_transactions = df_transactions.reset_index(drop=True)
+if __name__ == "__main__":
+    df_sms = pd.read_csv('sms_raw_dump.csv')
 
-print(df_transactions.head())
+    df_transactions = filter_transactions(df_sms)
 
-df_transactions.to_csv('sms_transactions.csv', index=False)
\ No newline at end of file
+    print(df_transactions.head())
+
+    df_transactions.to_csv('sms_transactions.csv', index=False)
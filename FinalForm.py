@@ -1,9 +1,7 @@
 import pandas as pd
 import re
-
-df = pd.read_csv("sms_transactions.csv")
-
-df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce').dt.date
+from payee_canonical import PayeeIndex, CACHE_FILE as PAYEE_CACHE_FILE
+from instrumentation import traced
 
 def extract_amount(text):
     if pd.isna(text):
@@ -69,7 +67,7 @@ PAYEE_CATEGORY_OVERRIDE = {
 }
 
 def categorize(text, description):
-    desc_lower = (description or '').lower()
+    desc_lower = description.lower() if isinstance(description, str) else ''
     for payee, cat in PAYEE_CATEGORY_OVERRIDE.items():
         if payee in desc_lower:
             return cat
@@ -81,13 +79,41 @@ def categorize(text, description):
             return v
     return 'Other'
 
-df['amount'] = df['body'].apply(extract_amount)
-df['type'] = df['body'].apply(extract_type)
-df['description'] = df['body'].apply(extract_description)
-df['category'] = df.apply(lambda row: categorize(row['body'], row['description']), axis=1)
+@traced("extract")
+def extract_fields(df):
+    """Parse date, amount, type and payee description out of each SMS body."""
+    df = df.copy()
+    # ISO8601 so rows without fractional seconds aren't coerced to NaT by format inference
+    df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce', format='ISO8601').dt.date
+    df['amount'] = df['body'].apply(extract_amount)
+    df['type'] = df['body'].apply(extract_type)
+    df['description'] = df['body'].apply(extract_description)
+    return df
+
+@traced("categorize")
+def categorize_transactions(df, payee_index=None, cache_file=None):
+    """Add the canonical payee name next to the raw description and assign a category.
+
+    Without a payee_index one is built from PAYEE_CATEGORY_OVERRIDE, loading and saving the
+    raw -> canonical cache at `cache_file` when one is given.
+    """
+    df = df.copy()
+    if payee_index is None:
+        if cache_file:
+            payee_index = PayeeIndex.load(cache_file, seeds=PAYEE_CATEGORY_OVERRIDE)
+        else:
+            payee_index = PayeeIndex(seeds=PAYEE_CATEGORY_OVERRIDE)
+    df['payee'] = payee_index.canonicalize_many(df['description'].tolist())
+    if cache_file:
+        payee_index.save(cache_file)
+    df['category'] = df.apply(lambda row: categorize(row['body'], row['payee']), axis=1)
+    return df[['date', 'description', 'payee', 'amount', 'type', 'category']]
+
+if __name__ == "__main__":
+    df = pd.read_csv("sms_transactions.csv")
 
-df_final = df[['date', 'description', 'amount', 'type', 'category']]
+    df_final = categorize_transactions(extract_fields(df), cache_file=PAYEE_CACHE_FILE)
 
-df_final.to_csv("structured_transactions.csv", index=False, quoting=1)
+    df_final.to_csv("structured_transactions.csv", index=False, quoting=1)
 
-print("Structured transactions saved to structured_transactions.csv")
\ No newline at end of file
+    print("Structured transactions saved to structured_transactions.csv")
@@ -2,8 +2,9 @@ import pandas as pd
 import numpy as np
 import re
 import matplotlib.pyplot as plt
-import json
 from datetime import datetime, timedelta
+from summary_export import export_summary
+from budget_projection import project_month, projection_alert
 
 # Load CSV
 df = pd.read_csv("structured_transactions.csv")
@@ -78,6 +79,11 @@ else:
             alert_msg += " You have exceeded your estimated monthly budget! Please adjust spending."
         weekly_alerts.append(alert_msg)
 
+    # Monte Carlo projection of month-end spend against the estimated budget
+    projection = project_month(df, current_month, monthly_budget_est)
+    if projection:
+        weekly_alerts.append(projection_alert(projection))
+
     for alert in weekly_alerts:
         print(alert)
 
@@ -105,8 +111,12 @@ else:
         print(f"No debit transactions found for {current_month} to plot pie chart.")
 
     # Use axes[0, 1] to target the subplot
-    axes[0, 1].plot(weekly_current['week_start'].astype(str), weekly_current['Cumulative Expense'], marker='o', label='Cumulative Expense')
+    axes[0, 1].plot(weekly_current['week_start'], weekly_current['Cumulative Expense'], marker='o', label='Cumulative Expense')
     axes[0, 1].axhline(weekly_current['Estimated Budget'].iloc[0], color='red', linestyle='--', label='Estimated Budget')
+    if projection:
+        bands = projection['bands']
+        axes[0, 1].fill_between(bands.index, bands.iloc[:, 0], bands.iloc[:, -1], color='tab:blue', alpha=0.2, label='Projected range')
+        axes[0, 1].plot(bands.index, bands['p50'], color='tab:blue', linestyle=':', label='Projected (median)')
     axes[0, 1].tick_params(axis='x', rotation=45)
     axes[0, 1].set_title(f"Weekly Cumulative Expenses vs Budget ({current_month})")
     axes[0, 1].set_ylabel("Amount (₹)")
@@ -127,10 +137,10 @@ else:
         "weekly_alerts": weekly_alerts
     }
 
-    with open("financial_summary.json", "w") as f:
-        json.dump(output, f, indent=4)
-
-    print("Financial summary saved to JSON successfully!")
+    if export_summary(output, "financial_summary.json"):
+        print("Financial summary saved to JSON successfully!")
+    else:
+        print("Financial summary JSON already up to date.")
 
 # Use axes[1, 0] to target the subplot
 axes[1, 0].plot(summary['Month'].astype(str), summary['Income'], marker='o', label='Income')
@@ -0,0 +1,343 @@
+import re
+import sys
+import math
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from Filter_Transactions import TRANSACTION_PATTERN
+from FinalForm import extract_amount, extract_type, extract_description, categorize
+from finance_backend import FinanceBackend, weekly_alert_message
+
+
+class AlertEngine:
+    """Push-based budget alerts, updated one transaction at a time.
+
+    Keeps running totals per month, per week of the current month and per category, plus
+    the inputs of FinanceBackend's budget estimate (mean past spending ratio and first-week
+    income), so each add() is a constant-time update instead of a rebuild of the weekly
+    table. When a transaction from a later month arrives, the current month is rolled into the
+    past-month statistics and tracking continues in the new month, so a long-running engine
+    keeps working across month boundaries. Events are returned from add() and passed to every
+    subscribed callback:
+
+      budget_exceeded  - the current month's spend crossed the estimated monthly budget (at most
+                         once a month, and only after the first-week income window has closed)
+      unusual_spend    - a debit more than `unusual_z` standard deviations above the mean debit
+      category_spike   - a category's spend this week is over `spike_factor` x its weekly average
+
+    weekly_table()/weekly_alerts() reproduce FinanceBackend.weekly_current/weekly_alerts;
+    run `python alert_engine.py --replay` to check them against the batch computation.
+    """
+
+    def __init__(self, current_month=None, unusual_z=3.0, min_history=20, spike_factor=2.0,
+                 min_weeks=4, default_ratio=0.8):
+        self.current_month = pd.Period(current_month or datetime.now(), freq='M')
+        self.unusual_z = unusual_z
+        self.min_history = min_history
+        self.spike_factor = spike_factor
+        self.min_weeks = min_weeks
+        self.default_ratio = default_ratio
+        self.subscribers = []
+
+        # Past months: income/expense per month and the running mean of expense/income
+        self.month_income = {}
+        self.month_expense = {}
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+        self.has_past = False
+
+        self._reset_current()
+
+        # Running mean/variance of debit amounts (Welford)
+        self.debit_count = 0
+        self.debit_mean = 0.0
+        self.debit_m2 = 0.0
+
+        # Category totals overall and per week, for spike detection
+        self.first_week = None
+        self.category_total = {}
+        self.category_week = {}
+        self.spiked = set()
+
+    def _reset_current(self):
+        # Current month: first-week income window and per-week debit totals
+        self.first_date = None
+        self.last_date = None
+        self.current_credits = []
+        self.first_week_income = 0.0
+        self.week_expense = {}
+        self.month_spent = 0.0
+        self.has_debit = False
+        self.exceeded = False
+
+    def _roll_month(self, month):
+        """Fold the current month into the past-month statistics and start tracking `month`."""
+        if self.current_credits:
+            self._add_past(self.current_month, 'credit', sum(a for _, a in self.current_credits))
+        if self.has_debit:
+            self._add_past(self.current_month, 'debit', self.month_spent)
+        self.current_month = month
+        self._reset_current()
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    # -------------------------
+    # Budget estimate (same rules as FinanceBackend.preprocess)
+    # -------------------------
+    @property
+    def avg_spending_ratio(self):
+        if not self.has_past:
+            return self.default_ratio
+        return self.ratio_sum / self.ratio_count if self.ratio_count else float('nan')
+
+    @property
+    def monthly_budget_est(self):
+        return self.first_week_income * self.avg_spending_ratio
+
+    def _month_ratio(self, month):
+        if month in self.month_income and month in self.month_expense:
+            income = self.month_income[month]
+            return self.month_expense[month] / income if income else float('nan')
+        return None
+
+    def _add_past(self, month, kind, amount):
+        old = self._month_ratio(month)
+        if kind == 'credit':
+            self.month_income[month] = self.month_income.get(month, 0.0) + amount
+        elif kind == 'debit':
+            self.month_expense[month] = self.month_expense.get(month, 0.0) + amount
+        new = self._month_ratio(month)
+
+        # NaN ratios are skipped like pandas' mean() does
+        if old is not None and not math.isnan(old):
+            self.ratio_sum -= old
+            self.ratio_count -= 1
+        if new is not None and not math.isnan(new):
+            self.ratio_sum += new
+            self.ratio_count += 1
+        self.has_past = True
+
+    def _add_current(self, date, kind, amount):
+        if kind == 'credit':
+            self.current_credits.append((date, amount))
+        elif kind == 'debit':
+            self.has_debit = True
+        if self.last_date is None or date > self.last_date:
+            self.last_date = date
+
+        if self.first_date is None or date < self.first_date:
+            # The first-week window moved earlier: recount it (rare, bounded by one month of credits)
+            self.first_date = date
+            window_end = date + timedelta(days=6)
+            self.first_week_income = sum(a for d, a in self.current_credits if d <= window_end)
+        elif kind == 'credit' and date <= self.first_date + timedelta(days=6):
+            self.first_week_income += amount
+
+        week_start = date - timedelta(days=date.weekday())
+        spend = amount if kind == 'debit' else 0.0
+        self.week_expense[week_start] = self.week_expense.get(week_start, 0.0) + spend
+        self.month_spent += spend
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def add(self, txn):
+        """Add one structured transaction (date, amount, type, category) and return the events it fired."""
+        date = pd.Timestamp(txn['date'])
+        if pd.isna(date):
+            return []
+        amount = txn['amount']
+        amount = 0.0 if amount is None or pd.isna(amount) else float(amount)
+        kind = txn['type']
+        category = txn.get('category') or 'Other'
+        month = date.to_period('M')
+        events = []
+
+        if kind == 'debit':
+            events += self._check_unusual(date, amount, category)
+
+        if month > self.current_month:
+            self._roll_month(month)
+        if month < self.current_month:
+            self._add_past(month, kind, amount)
+        elif month == self.current_month:
+            self._add_current(date, kind, amount)
+
+        if kind == 'debit':
+            events += self._check_category_spike(date, amount, category)
+
+        events += self._check_budget(date)
+
+        for event in events:
+            for callback in self.subscribers:
+                callback(event)
+        return events
+
+    def add_many(self, df):
+        """Micro-batch version of add() for a DataFrame of structured transactions."""
+        events = []
+        for txn in df[['date', 'amount', 'type', 'category']].to_dict(orient='records'):
+            events += self.add(txn)
+        return events
+
+    def ingest_sms(self, sms, payee_index=None):
+        """Run one raw SMS (dict with 'date' and 'body') through filter/extract/categorize and add it."""
+        body = sms.get('body')
+        if not isinstance(body, str) or not re.search(TRANSACTION_PATTERN, body):
+            return []
+        description = extract_description(body)
+        if payee_index is not None:
+            description = payee_index.canonicalize(description)
+        date = pd.to_datetime(sms['date'], utc=True, errors='coerce')
+        if pd.isna(date):
+            return []
+        return self.add({
+            'date': pd.Timestamp(date.date()),
+            'amount': extract_amount(body),
+            'type': extract_type(body),
+            'category': categorize(body, description),
+        })
+
+    # -------------------------
+    # Event checks
+    # -------------------------
+    def _check_budget(self, date):
+        # The estimate is first-week income x ratio, so it isn't meaningful until that week is
+        # over; before then (or with no income at all) there is nothing to exceed
+        if self.exceeded or self.first_date is None or self.last_date <= self.first_date + timedelta(days=6):
+            return []
+        budget = self.monthly_budget_est
+        if not budget > 0 or self.month_spent <= budget:
+            return []
+        self.exceeded = True
+        return [{
+            "kind": "budget_exceeded",
+            "date": date,
+            "message": (
+                f"Spending for {self.current_month} reached ₹{self.month_spent:.2f}, "
+                f"over the estimated monthly budget ₹{budget:.2f}. ⚠️ Please adjust spending."
+            ),
+            "spent": self.month_spent,
+            "budget": budget,
+        }]
+
+    def _check_unusual(self, date, amount, category):
+        fired = []
+        if self.debit_count >= self.min_history:
+            std = math.sqrt(self.debit_m2 / (self.debit_count - 1))
+            if std > 0 and (amount - self.debit_mean) / std > self.unusual_z:
+                fired.append({
+                    "kind": "unusual_spend",
+                    "date": date,
+                    "message": (
+                        f"Unusual {category} spend of ₹{amount:.2f} on {date.date()} "
+                        f"(typical debit ₹{self.debit_mean:.2f})."
+                    ),
+                    "amount": amount,
+                    "category": category,
+                })
+
+        self.debit_count += 1
+        delta = amount - self.debit_mean
+        self.debit_mean += delta / self.debit_count
+        self.debit_m2 += delta * (amount - self.debit_mean)
+        return fired
+
+    def _check_category_spike(self, date, amount, category):
+        week_start = (date - timedelta(days=date.weekday())).normalize()
+        if self.first_week is None or week_start < self.first_week:
+            self.first_week = week_start
+
+        key = (week_start, category)
+        self.category_total[category] = self.category_total.get(category, 0.0) + amount
+        self.category_week[key] = self.category_week.get(key, 0.0) + amount
+
+        # Average over the weeks before this one (assumes roughly chronological arrival)
+        weeks_before = (week_start - self.first_week).days // 7
+        if weeks_before < self.min_weeks or key in self.spiked:
+            return []
+        this_week = self.category_week[key]
+        weekly_avg = (self.category_total[category] - this_week) / weeks_before
+        if weekly_avg <= 0 or this_week <= self.spike_factor * weekly_avg:
+            return []
+
+        self.spiked.add(key)
+        return [{
+            "kind": "category_spike",
+            "date": date,
+            "message": (
+                f"{category} spending this week (from {week_start.date()}) is ₹{this_week:.2f}, "
+                f"{this_week / weekly_avg:.1f}x its weekly average of ₹{weekly_avg:.2f}."
+            ),
+            "category": category,
+            "amount": this_week,
+        }]
+
+    # -------------------------
+    # Batch-equivalent views
+    # -------------------------
+    def weekly_table(self):
+        """The current month's weekly table, in the shape of FinanceBackend.weekly_current."""
+        if not self.week_expense:
+            return pd.DataFrame()
+        weeks = sorted(self.week_expense)
+        weekly = pd.DataFrame({
+            'week_start': weeks,
+            'week_end': [w + timedelta(days=6) for w in weeks],
+            'Weekly Expense': [self.week_expense[w] for w in weeks],
+        })
+        budget = self.monthly_budget_est
+        weekly['Cumulative Expense'] = weekly['Weekly Expense'].cumsum()
+        weekly['Remaining Budget'] = budget - weekly['Cumulative Expense']
+        weekly['Estimated Budget'] = budget
+        weekly['First Week Income'] = self.first_week_income
+        return weekly
+
+    def weekly_alerts(self):
+        return [weekly_alert_message(row, self.current_month) for _, row in self.weekly_table().iterrows()]
+
+
+def replay(backend, shuffle_seed=None):
+    """Feed every transaction of a FinanceBackend through a fresh AlertEngine and compare the
+    resulting weekly table and alert lines with the batch computation. Returns (ok, engine);
+    ok is only True if every weekly row and every alert line matches."""
+    df = backend.df
+    if shuffle_seed is not None:
+        df = df.sample(frac=1, random_state=shuffle_seed)
+
+    engine = AlertEngine()
+    events = engine.add_many(df)
+    batch = backend.weekly_current
+    stream = engine.weekly_table()
+
+    ok = len(batch) == len(stream)
+    if ok and not batch.empty:
+        ok = (batch['week_start'].tolist() == stream['week_start'].tolist())
+        for col in ['Weekly Expense', 'Cumulative Expense', 'Remaining Budget', 'Estimated Budget', 'First Week Income']:
+            ok = ok and bool(np.allclose(batch[col], stream[col], equal_nan=True))
+        ok = ok and ((batch['Remaining Budget'] < 0).tolist() == (stream['Remaining Budget'] < 0).tolist())
+
+    batch_alerts = backend.weekly_alerts[:len(batch)]
+    stream_alerts = engine.weekly_alerts()
+    matching_alerts = sum(a == b for a, b in zip(batch_alerts, stream_alerts))
+    ok = ok and len(stream_alerts) == len(batch_alerts) and matching_alerts == len(batch_alerts)
+
+    print(f"Replayed {len(df)} transactions: {len(events)} events fired "
+          f"({', '.join(sorted({e['kind'] for e in events})) or 'none'})")
+    print(f"Weekly rows: batch {len(batch)}, stream {len(stream)}; "
+          f"identical alert lines: {matching_alerts}/{len(batch_alerts)}")
+    print("✅ Streaming alerts match the batch computation" if ok else "❌ Streaming alerts differ from the batch computation")
+    return ok, engine
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Replay transactions through the alert engine and compare with FinanceBackend.")
+    arg_parser.add_argument("--replay", default="structured_transactions.csv", help="Structured transactions CSV")
+    arg_parser.add_argument("--shuffle", type=int, default=None, help="Replay in a random order with this seed")
+    args = arg_parser.parse_args()
+
+    ok, _ = replay(FinanceBackend(args.replay), args.shuffle)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,153 @@
+import io
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import contextlib
+import pandas as pd
+
+import financial_analyzer
+import gemini_chatbot
+from parser import iter_sms_blocks, parse_sms_block
+from iphone_sms import fetch_messages
+from Filter_Transactions import filter_transactions
+from FinalForm import extract_fields, categorize_transactions, PAYEE_CATEGORY_OVERRIDE
+from payee_canonical import PayeeIndex
+from finance_backend import FinanceBackend
+from budget_projection import project_month
+from alert_engine import AlertEngine
+from summary_export import summary_document, serialize, atomic_write
+from synthetic_data import generate_files
+
+BASELINE_FILE = "benchmark_baselines.json"
+
+
+def _parse_adb(path):
+    with open(path) as f:
+        return [parse_sms_block(block) for block in iter_sms_blocks(f)]
+
+
+# (name, input key in the context, output key, function). Stages run in this order and each
+# one's last output becomes the input of the stages after it.
+STAGES = [
+    ("adb_parse", "adb", None, _parse_adb),
+    ("iphone_extract", "sqlite", None, fetch_messages),
+    ("csv_load", "csv", "raw", pd.read_csv),
+    ("filter", "raw", "transactions", filter_transactions),
+    ("extract", "transactions", "extracted", extract_fields),
+    ("categorize", "extracted", "structured",
+     lambda df: categorize_transactions(df, PayeeIndex(seeds=PAYEE_CATEGORY_OVERRIDE))),
+    ("backend", "structured", "backend", lambda df: FinanceBackend(df=df)),
+    ("projection", "backend", None, lambda b: project_month(b.df, budget=b.summary['Expense'].mean())),
+    ("alert_replay", "backend", None, lambda b: AlertEngine().add_many(b.df)),
+    ("summary_export", "backend", None,
+     lambda b: atomic_write("financial_summary.json", serialize(summary_document(b)))),
+    ("analyzer", "backend", None,
+     lambda b: (financial_analyzer.get_weekly_summary(b.df), financial_analyzer.get_monthly_summary(b.df))),
+    ("chat_context", "backend", None, lambda b: gemini_chatbot.get_data_as_string(b.df)),
+]
+
+
+def time_call(fn, arg, repeat=5, warmup=1):
+    """Median/min wall time of fn(arg) over `repeat` runs, with GC paused and stdout muted."""
+    timings, result = [], None
+    for i in range(warmup + repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                result = fn(arg)
+                elapsed = time.perf_counter() - t0
+        finally:
+            gc.enable()
+        if i >= warmup:
+            timings.append(elapsed)
+    return {"median": statistics.median(timings), "min": min(timings)}, result
+
+
+def run(sizes, repeat=5, stages=None, seed=0, end=None):
+    """Benchmark every stage at every size inside a scratch directory; returns {"stage@size": timing}."""
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            for n in sizes:
+                print(f"\n📦 {n:,} messages (seed {seed})")
+                ctx = generate_files(n, os.path.join(workdir, str(n)), seed=seed, end=end)
+                for name, source, target, fn in STAGES:
+                    if stages and name not in stages:
+                        # Not timed, but later stages may still need its output
+                        if target:
+                            with contextlib.redirect_stdout(io.StringIO()):
+                                ctx[target] = fn(ctx[source])
+                        continue
+                    timing, output = time_call(fn, ctx[source], repeat=repeat)
+                    if target:
+                        ctx[target] = output
+                    results[f"{name}@{n}"] = timing
+                    print(f"   {name:<16} median {timing['median']:>9.4f}s   min {timing['min']:>9.4f}s")
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change vs the stored baseline and return the keys that regressed beyond threshold."""
+    regressions = []
+    print(f"\n{'stage@size':<28} {'baseline':>10} {'now':>10} {'change':>8}")
+    for key, timing in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<28} {'-':>10} {timing['median']:>10.4f} {'new':>8}")
+            continue
+        change = timing['median'] / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = " ❌ regression"
+        print(f"{key:<28} {base:>10.4f} {timing['median']:>10.4f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on seeded synthetic data.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Message counts (10k .. 10M)")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--stages", nargs="+", choices=[s[0] for s in STAGES], help="Only time these stages")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--end", help="Last day of synthetic data (YYYY-MM-DD); defaults to today")
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE)
+    arg_parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = arg_parser.parse_args()
+
+    baseline_path = os.path.abspath(args.baseline)
+    results = run(args.sizes, args.repeat, args.stages, args.seed, args.end)
+
+    if args.save_baseline:
+        stored = {"results": {}}
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                stored = json.load(f)
+        stored["machine"] = f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+        stored["results"].update({key: round(t["median"], 6) for key, t in results.items()})
+        with open(baseline_path, "w") as f:
+            json.dump(stored, f, indent=4, sort_keys=True)
+        print(f"\n✅ Baseline saved to {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+    else:
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one.")
@@ -0,0 +1,124 @@
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+
+def daily_spend_matrix(df, before):
+    """Daily debit totals per category for every day before `before` (days with no spend are 0).
+
+    Returns (categories, matrix) where matrix has one row per day and one column per category.
+    """
+    debits = df[(df['type'] == 'debit') & (df['date'] < before)]
+    if debits.empty:
+        return [], np.empty((0, 0))
+
+    days = debits['date'].dt.normalize()
+    daily = debits.groupby([days, 'category'])['amount'].sum().unstack(fill_value=0)
+    all_days = pd.date_range(daily.index.min(), pd.Timestamp(before).normalize() - pd.Timedelta(days=1), freq='D')
+    daily = daily.reindex(all_days, fill_value=0)
+    return list(daily.columns), daily.to_numpy(dtype=float)
+
+
+def project_month(df, month=None, budget=None, n_sims=10000, as_of=None,
+                  percentiles=(10, 50, 90), seed=0):
+    """Monte Carlo projection of a month's spending.
+
+    Each simulation bootstraps whole historical days (all categories together, so
+    co-occurring spends stay correlated) for every remaining day of `month`. For the
+    current month the spend already recorded up to `as_of` is the starting point; future
+    months start from zero. A fixed `seed` keeps the result reproducible between runs.
+
+    Returns None when there is no debit history to sample from, otherwise a dict with
+    percentile bands of cumulative spend per remaining day, month-end percentiles
+    (overall and per category) and the probability of exceeding `budget`.
+    """
+    as_of = pd.Timestamp(as_of or datetime.now()).normalize()
+    month = pd.Period(month or as_of, freq='M')
+    month_start = month.start_time
+    month_end = month.end_time.normalize()
+
+    if month_end < as_of:
+        raise ValueError(f"Cannot project {month}: it ended before {as_of.date()}")
+
+    categories, history = daily_spend_matrix(df, before=as_of)
+    if history.size == 0:
+        return None
+
+    # Spend already recorded this month, and the days still to simulate
+    if month_start <= as_of:
+        in_month = df[(df['type'] == 'debit') & (df['date'] >= month_start) & (df['date'] < as_of)]
+        spent = in_month.groupby('category')['amount'].sum().reindex(categories, fill_value=0).to_numpy()
+        days = pd.date_range(as_of, month_end, freq='D')
+    else:
+        spent = np.zeros(len(categories))
+        days = pd.date_range(month_start, month_end, freq='D')
+
+    rng = np.random.default_rng(seed)
+    sampled_days = rng.integers(0, history.shape[0], size=(n_sims, len(days)))
+
+    trajectories = spent.sum() + np.cumsum(history.sum(axis=1)[sampled_days], axis=1)
+    totals = trajectories[:, -1] if len(days) else np.full(n_sims, spent.sum())
+    category_totals = np.column_stack([
+        spent[c] + history[:, c][sampled_days].sum(axis=1) for c in range(len(categories))
+    ])
+
+    # Ascending, so the first and last columns are always the low and high ends of the range
+    percentiles = sorted(percentiles)
+    cols = [f"p{p}" for p in percentiles]
+    bands = pd.DataFrame(np.percentile(trajectories, percentiles, axis=0).T, index=days, columns=cols)
+    category_bands = pd.DataFrame(np.percentile(category_totals, percentiles, axis=0).T,
+                                  index=categories, columns=cols)
+
+    return {
+        "month": str(month),
+        "budget": budget,
+        "spent_so_far": float(spent.sum()),
+        "n_sims": n_sims,
+        "bands": bands,
+        "total_percentiles": dict(zip(cols, np.percentile(totals, percentiles).tolist())),
+        "median_total": float(np.median(totals)),
+        "category_percentiles": category_bands,
+        # A NaN budget (no past income to estimate it from) can't be exceeded meaningfully
+        "prob_exceed_budget": (float((totals > budget).mean())
+                               if budget is not None and np.isfinite(budget) else None),
+    }
+
+
+def projection_alert(projection):
+    """One-line alert in the style of FinanceBackend.weekly_alerts."""
+    p = projection["total_percentiles"]
+    values = list(p.values())
+    low, mid, high = values[0], projection["median_total"], values[-1]
+    msg = (
+        f"Projection for {projection['month']} ({projection['n_sims']} simulations): "
+        f"month-end spend ₹{mid:.2f} (likely range ₹{low:.2f} - ₹{high:.2f})"
+    )
+    if projection["prob_exceed_budget"] is not None:
+        msg += (
+            f", {projection['prob_exceed_budget']:.0%} chance of exceeding "
+            f"the estimated budget ₹{projection['budget']:.2f}"
+        )
+        if projection["prob_exceed_budget"] >= 0.5:
+            msg += f" ⚠️ You are likely to overshoot your budget in {projection['month']}."
+    return msg
+
+
+if __name__ == "__main__":
+    # Quick timing check on two years of synthetic daily spending
+    rng = np.random.default_rng(1)
+    dates = pd.date_range(pd.Timestamp.now().normalize() - pd.Timedelta(days=730), periods=5000, freq='3.5h')
+    df = pd.DataFrame({
+        'date': dates,
+        'type': rng.choice(['debit', 'credit'], size=len(dates), p=[0.85, 0.15]),
+        'amount': rng.gamma(2.0, 400.0, size=len(dates)).round(2),
+        'category': rng.choice(['Food', 'Shopping', 'Bills', 'Travel', 'Transfer', 'Other'], size=len(dates)),
+    })
+
+    for month in [None, pd.Period(datetime.now(), freq='M') + 3]:
+        t0 = time.perf_counter()
+        projection = project_month(df, month=month, budget=60000, n_sims=10000)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"{projection['month']}: {elapsed:.1f} ms")
+        print(projection_alert(projection))
+        print(projection['category_percentiles'].round(2), "\n")
@@ -1,12 +1,14 @@
 from huggingface_hub import InferenceClient
-from finance_backend import FinanceBackend
+from finance_backend import FinanceBackend, SNAPSHOT_FILE
 import matplotlib.pyplot as plt
 import io
 import base64
+from instrumentation import span
 
 class FinanceChatbot:
     def __init__(self, hf_token: str):
-        self.backend = FinanceBackend()
+        # Warm start from the snapshot while structured_transactions.csv is unchanged
+        self.backend = FinanceBackend(snapshot_file=SNAPSHOT_FILE)
         self.client = InferenceClient(token=hf_token)
         self.context = []
 
@@ -15,8 +17,10 @@ class FinanceChatbot:
         prompt = "\n".join(self.context) + "\nAssistant:"
 
         # Use Hugging Face hosted inference
-        response = self.client.text_generation(model="tiiuae/falcon-7b-instruct", inputs=prompt, parameters={"max_new_tokens":200, "temperature":0.7})
-        assistant_reply = response[0]['generated_text'].split("Assistant:")[-1].strip()
+        with span("llm.huggingface", model="tiiuae/falcon-7b-instruct", prompt_chars=len(prompt)) as s:
+            response = self.client.text_generation(model="tiiuae/falcon-7b-instruct", inputs=prompt, parameters={"max_new_tokens":200, "temperature":0.7})
+            assistant_reply = response[0]['generated_text'].split("Assistant:")[-1].strip()
+            s.set(response_chars=len(assistant_reply))
 
         self.context.append(f"Assistant: {assistant_reply}")
         return assistant_reply
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import time
+import asyncio
+
+# Stands in for the adb binary so the multi-device fetch in parser.py can be exercised without
+# phones. Devices come from FAKE_ADB_DEVICES, a comma-separated list of
+#   serial:state[:delay_seconds[:messages]]
+# where state is what `adb devices` shows (device / unauthorized / offline) and messages is a
+# count or "none" for a phone whose SMS query prints "No result found.". For example:
+#   ADB=./fake_adb.py FAKE_ADB_DEVICES="phone1:device:1:3,phone2:unauthorized" python parser.py
+# `python fake_adb.py --check` runs parser.py's fetch against a set of fake devices.
+
+BASE_MS = 1760000000000
+
+
+def parse_devices(spec):
+    devices = {}
+    for entry in filter(None, spec.split(",")):
+        serial, state, *rest = entry.split(":")
+        delay = float(rest[0]) if rest else 0.0
+        messages = rest[1] if len(rest) > 1 else "3"
+        devices[serial] = {"state": state, "delay": delay, "messages": None if messages == "none" else int(messages)}
+    return devices
+
+
+def fake_sms_rows(serial, n):
+    """`content query` output for n messages; every other body spans two lines, as real ones can."""
+    for i in range(n):
+        body = f"Rs.{100 + i}.00 debited from A/c XX1234 to ZOMATO LTD on device {serial}"
+        if i % 2:
+            body += "\nAvl Bal Rs.5000"
+        yield (f"Row: {i} _id={i + 1}, address=VM-HDFCBK, date={BASE_MS + i * 60000}, "
+               f"body={body}, type=1, thread_id=1")
+
+
+def run_as_adb(argv):
+    devices = parse_devices(os.environ.get("FAKE_ADB_DEVICES", ""))
+    if argv[:1] == ["devices"]:
+        print("List of devices attached")
+        for serial, device in devices.items():
+            print(f"{serial}\t{device['state']}")
+        return 0
+
+    if argv[:1] != ["-s"] or len(argv) < 2:
+        print("error: more than one device/emulator", file=sys.stderr)
+        return 1
+    device = devices.get(argv[1])
+    if device is None or device["state"] != "device":
+        print(f"error: device '{argv[1]}' not found", file=sys.stderr)
+        return 1
+
+    time.sleep(device["delay"])
+    if device["messages"] is None:
+        print("No result found.")
+    else:
+        for row in fake_sms_rows(argv[1], device["messages"]):
+            print(row)
+    return 0
+
+
+# -------------------------
+# Check
+# -------------------------
+def check():
+    from parser import list_adb_devices, fetch_devices_sms
+
+    adb = os.path.abspath(__file__)
+    failures = []
+
+    def expect(ok, message):
+        print(("✅ " if ok else "❌ ") + message)
+        if not ok:
+            failures.append(message)
+
+    os.environ["FAKE_ADB_DEVICES"] = ",".join([
+        "phone1:device:1:3", "phone2:device:1:4", "phone3:device:1:5", "phone4:device:1:none",
+        "phone5:unauthorized", "phone6:offline",
+    ])
+    serials = list_adb_devices(adb)
+    expect(serials == ["phone1", "phone2", "phone3", "phone4"],
+           f"only ready devices are listed (unauthorized/offline skipped): {serials}")
+
+    t0 = time.perf_counter()
+    df = asyncio.run(fetch_devices_sms(serials, max_concurrency=4, adb=adb))
+    elapsed = time.perf_counter() - t0
+    # Run one after another they would take over 4 s
+    expect(elapsed < 2.5, f"4 devices x 1 s with max_concurrency=4 finish concurrently ({elapsed:.2f}s)")
+
+    counts = df['device_id'].value_counts().to_dict()
+    expect(counts == {"phone1": 3, "phone2": 4, "phone3": 5}, f"rows per device_id: {counts}")
+    expect(all(re.search(r"on device (\w+)", body).group(1) == device
+               for body, device in zip(df['body'], df['device_id'])),
+           "every row is tagged with the device it came from")
+    expect(df['body'].str.contains("Avl Bal").sum() == 1 + 2 + 2, "multi-line bodies are kept whole")
+    expect("phone4" not in counts, "a device printing 'No result found.' contributes no rows")
+
+    t0 = time.perf_counter()
+    asyncio.run(fetch_devices_sms(serials, max_concurrency=2, adb=adb))
+    elapsed = time.perf_counter() - t0
+    expect(1.9 < elapsed < 3.5, f"max_concurrency=2 runs them two at a time ({elapsed:.2f}s)")
+
+    print("\n✅ adb fetch check passed" if not failures else f"\n❌ {len(failures)} check(s) failed")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--check"]:
+        sys.exit(check())
+    sys.exit(run_as_adb(sys.argv[1:]))
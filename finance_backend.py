@@ -1,17 +1,121 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import json
+import os
+import pickle
+import hashlib
 from datetime import datetime, timedelta
+from summary_export import summary_document, export_summary, atomic_write
+from budget_projection import project_month, projection_alert
+from instrumentation import traced, span
+
+SNAPSHOT_FILE = ".backend_snapshot.pkl"
+# Bump when the preprocessed state changes shape so old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+def weekly_alert_message(row, current_month):
+    """Alert line for one row of the weekly table (also used by alert_engine.py)."""
+    alert_msg = (
+        f"Week {row['week_start']} - {row['week_end']} (Month: {current_month}): "
+        f"Weekly expenditure ₹{row['Weekly Expense']:.2f}, "
+        f"Estimated monthly budget ₹{row['Estimated Budget']:.2f} "
+        f"(first week income ₹{row['First Week Income']:.2f}), "
+        f"Remaining budget ₹{row['Remaining Budget']:.2f}"
+    )
+    if row['Remaining Budget'] < 0:
+        alert_msg += " ⚠️ You have exceeded your estimated monthly budget! Please adjust spending."
+    return alert_msg
+
+def source_fingerprint(path, with_hash=True):
+    """Size, mtime and (optionally) sha256 of a source file."""
+    stat = os.stat(path)
+    fingerprint = {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+def _snapshot_key(csv_file):
+    return {
+        "version": SNAPSHOT_VERSION,
+        "pandas": pd.__version__,
+        "month": str(pd.Period(datetime.now(), freq='M')),
+        "source": source_fingerprint(csv_file, with_hash=False),
+    }
+
+def _snapshot_matches(stored, key):
+    """Same version, month and source file; the content hash is only checked when mtime moved."""
+    if any(stored.get(k) != key[k] for k in ("version", "pandas", "month")):
+        return False
+    old, new = stored.get("source", {}), key["source"]
+    if old.get("path") != new["path"] or old.get("size") != new["size"]:
+        return False
+    if old.get("mtime_ns") == new["mtime_ns"]:
+        return True
+    # Touched or copied but possibly unchanged (e.g. a pipeline rerun over the same SMS)
+    return old.get("sha256") == source_fingerprint(new["path"])["sha256"]
 
 class FinanceBackend:
-    def __init__(self, csv_file="structured_transactions.csv"):
+    def __init__(self, csv_file="structured_transactions.csv", df=None, snapshot_file=None):
         self.csv_file = csv_file
-        self.df = pd.read_csv(self.csv_file)
+        # With snapshot_file set, a CSV-backed backend restores its preprocessed state from
+        # there when the CSV and current month are unchanged (recomputing only the
+        # date-dependent projection), and refreshes it otherwise
+        use_snapshot = df is None and snapshot_file
+        if use_snapshot:
+            if self._restore_snapshot(snapshot_file):
+                return
+            # Fingerprint before reading, so a CSV rewritten mid-run never matches stale state
+            source = source_fingerprint(self.csv_file)
+
+        # An already structured DataFrame (e.g. from pipeline.py) skips the CSV read
+        self.df = df.copy() if df is not None else pd.read_csv(self.csv_file)
         self.df['date'] = pd.to_datetime(self.df['date'])
         self.df['month'] = self.df['date'].dt.to_period('M')
         self.preprocess()
 
+        if use_snapshot:
+            self._save_snapshot(snapshot_file, source)
+
+    # -------------------------
+    # Warm-start snapshot
+    # -------------------------
+    def _restore_snapshot(self, snapshot_file):
+        if not os.path.exists(snapshot_file):
+            return False
+        with span("backend.snapshot_load") as s:
+            try:
+                key = _snapshot_key(self.csv_file)
+                with open(snapshot_file, "rb") as f:
+                    # The key is pickled ahead of the state, so a stale snapshot is rejected unread
+                    if not _snapshot_matches(pickle.load(f), key):
+                        s.set(hit=False)
+                        return False
+                    state = pickle.load(f)
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable snapshot {snapshot_file}: {e}")
+                return False
+            self.__dict__.update(state)
+            self.update_projection()
+            s.set(hit=True, rows=len(self.df))
+        return True
+
+    def _save_snapshot(self, snapshot_file, source):
+        try:
+            key = _snapshot_key(self.csv_file)
+            key["source"] = source
+            state = dict(self.__dict__, weekly_alerts=self.weekly_alerts[:len(self.weekly_current)])
+            state.pop("projection", None)
+            data = (pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+                    + pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            atomic_write(snapshot_file, data)
+        except OSError as e:
+            print(f"⚠️ Could not write snapshot {snapshot_file}: {e}")
+
+    @traced("backend.preprocess")
     def preprocess(self):
         df = self.df
 
@@ -70,21 +174,28 @@ class FinanceBackend:
             # Weekly alerts
             self.weekly_alerts = []
             for _, row in self.weekly_current.iterrows():
-                alert_msg = (
-                    f"Week {row['week_start']} - {row['week_end']} (Month: {current_month}): "
-                    f"Weekly expenditure ₹{row['Weekly Expense']:.2f}, "
-                    f"Estimated monthly budget ₹{row['Estimated Budget']:.2f} "
-                    f"(first week income ₹{row['First Week Income']:.2f}), "
-                    f"Remaining budget ₹{row['Remaining Budget']:.2f}"
-                )
-                if row['Remaining Budget'] < 0:
-                    alert_msg += " ⚠️ You have exceeded your estimated monthly budget! Please adjust spending."
-                self.weekly_alerts.append(alert_msg)
+                self.weekly_alerts.append(weekly_alert_message(row, current_month))
 
         else:
             self.weekly_current = pd.DataFrame()
             self.weekly_alerts = []
 
+        self.update_projection()
+
+    def update_projection(self):
+        """Monte Carlo projection of month-end spend against the estimated budget.
+
+        It starts from today, so unlike the rest of preprocess() it goes stale daily; it is
+        left out of snapshots and recomputed on restore. Its alert is the last weekly alert.
+        """
+        self.weekly_alerts = self.weekly_alerts[:len(self.weekly_current)]
+        self.projection = None
+        if not self.df_current.empty:
+            current_month = pd.Period(datetime.now(), freq='M')
+            self.projection = project_month(self.df, current_month, self.monthly_budget_est)
+            if self.projection:
+                self.weekly_alerts.append(projection_alert(self.projection))
+
     # -------------------------
     # Functions to access data
     # -------------------------
@@ -100,26 +211,20 @@ class FinanceBackend:
     # -------------------------
     # JSON export
     # -------------------------
-    def save_summary_json(self, filename="financial_summary.json"):
-        self.summary['Month'] = self.summary['Month'].astype(str)
-        if not self.weekly_current.empty:
-            self.weekly_current['week_start'] = self.weekly_current['week_start'].astype(str)
-            self.weekly_current['week_end'] = self.weekly_current['week_end'].astype(str)
-
-        output = {
-            "monthly_summary": self.summary.to_dict(orient='records'),
-            "weekly_summary": self.weekly_current.to_dict(orient='records') if not self.weekly_current.empty else [],
-            "weekly_alerts": self.weekly_alerts
-        }
+    def save_summary_json(self, filename="financial_summary.json", fmt="pretty", delta_file=None):
+        """Export the summary (see summary_export.py). Returns False if the file was already up to date."""
+        written = export_summary(summary_document(self), filename, fmt=fmt, delta_file=delta_file)
 
-        with open(filename, "w") as f:
-            json.dump(output, f, indent=4)
-
-        print(f"Financial summary saved to {filename} successfully!")
+        if written:
+            print(f"Financial summary saved to {filename} successfully!")
+        else:
+            print(f"Financial summary in {filename} is already up to date.")
+        return written
 
     # -------------------------
     # Plotting functions
     # -------------------------
+    @traced("plot.monthly_income_expense")
     def plot_monthly_income_expense(self):
         plt.figure(figsize=(8,5))
         plt.plot(self.summary['Month'].astype(str), self.summary['Income'], marker='o', label='Income')
@@ -132,6 +237,7 @@ class FinanceBackend:
         plt.tight_layout()
         plt.show()
 
+    @traced("plot.current_month_expense")
     def plot_current_month_expense(self):
         if self.df_current.empty:
             print("No debit transactions found for current month to plot.")
@@ -152,13 +258,18 @@ class FinanceBackend:
         plt.tight_layout()
         plt.show()
 
+    @traced("plot.weekly_cumulative_vs_budget")
     def plot_weekly_cumulative_vs_budget(self):
         if self.weekly_current.empty:
             print("No weekly data to plot.")
             return
         plt.figure(figsize=(10,5))
-        plt.plot(self.weekly_current['week_start'].astype(str), self.weekly_current['Cumulative Expense'], marker='o', label='Cumulative Expense')
+        plt.plot(pd.to_datetime(self.weekly_current['week_start']), self.weekly_current['Cumulative Expense'], marker='o', label='Cumulative Expense')
         plt.axhline(self.weekly_current['Estimated Budget'].iloc[0], color='red', linestyle='--', label='Estimated Budget')
+        if self.projection:
+            bands = self.projection['bands']
+            plt.fill_between(bands.index, bands.iloc[:, 0], bands.iloc[:, -1], color='tab:blue', alpha=0.2, label='Projected range')
+            plt.plot(bands.index, bands['p50'], color='tab:blue', linestyle=':', label='Projected (median)')
         plt.xticks(rotation=45)
         plt.title(f"Weekly Cumulative Expenses vs Estimated Budget ({pd.Period(datetime.now(), freq='M')})")
         plt.ylabel("Amount (₹)")
@@ -1,6 +1,7 @@
 import google.generativeai as genai
 import SCS_3_0.gemini_chatbot as gemini_chatbot
 import SCS_3_0.financial_analyzer as financial_analyzer
+from SCS_3_0.instrumentation import span
 
 # config
 def configure_gemini():
@@ -58,7 +59,9 @@ def chat_with_bot():
             Question: {user_prompt}
             """
 
-        response = model.generate_content(prompt_for_llm)
+        with span("llm.gemini", model="gemini-2.5-flash", prompt_chars=len(prompt_for_llm)) as s:
+            response = model.generate_content(prompt_for_llm)
+            s.set(response_chars=len(response.text))
         print(f"Assistant: {response.text}\n")
 
 
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import time
+import uuid
+import atexit
+import cProfile
+import functools
+import threading
+import contextvars
+import tracemalloc
+from collections import defaultdict
+
+# Tracing is off unless FINTRACK_TRACE is set:
+#   FINTRACK_TRACE=1                 -> spans appended to fintrack_trace.jsonl
+#   FINTRACK_TRACE=path/to/run.jsonl -> spans appended to that file
+#   FINTRACK_TRACE_MEMORY=1          -> also record each span's peak memory above its starting level (tracemalloc, slower)
+#   FINTRACK_PROFILE=path.prof       -> cProfile the whole run and dump stats there on exit
+# When off, span() hands back a shared no-op object and traced() returns the function unchanged.
+TRACE = os.environ.get("FINTRACK_TRACE", "")
+ENABLED = TRACE.lower() not in ("", "0", "false")
+TRACE_FILE = TRACE if ENABLED and TRACE.lower() not in ("1", "true") else "fintrack_trace.jsonl"
+TRACE_MEMORY = ENABLED and os.environ.get("FINTRACK_TRACE_MEMORY", "") not in ("", "0")
+PROFILE_FILE = os.environ.get("FINTRACK_PROFILE")
+
+RUN_ID = uuid.uuid4().hex[:12]
+
+# Innermost open span of the current thread / asyncio task
+_current = contextvars.ContextVar("fintrack_span", default=None)
+_lock = threading.Lock()
+_trace_out = None
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed stage. Extra attributes (rows, prompt_chars, device, ...) go in the trace record."""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.child_peak = 0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self._token = _current.set(self)
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent:
+                # reset_peak() below would lose the parent's peak so far
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            self.base_bytes = current
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._t0
+        record = {
+            "run_id": RUN_ID,
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "start": self.start,
+            "seconds": seconds,
+        }
+        if TRACE_MEMORY:
+            # Nested spans reset the peak, so fold their (absolute) peaks back into the parent;
+            # the recorded figure is the growth over what was already live when the span began
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            record["peak_bytes"] = max(peak - self.base_bytes, 0)
+            if self.parent:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(self.attrs)
+
+        _current.reset(self._token)
+        _write(record)
+        return False
+
+
+def _write(record):
+    global _trace_out
+    with _lock:
+        if _trace_out is None:
+            _trace_out = open(TRACE_FILE, "a", buffering=1)
+        _trace_out.write(json.dumps(record, default=str) + "\n")
+
+
+def span(name, **attrs):
+    """Context manager timing a block: `with span("filter") as s: ...; s.set(rows=len(df))`."""
+    if not ENABLED:
+        return NOOP_SPAN
+    return Span(name, attrs)
+
+
+def traced(name=None):
+    """Decorator timing every call; DataFrame/list results are recorded as `rows`."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name or fn.__qualname__) as s:
+                result = fn(*args, **kwargs)
+                if hasattr(result, "__len__") and not isinstance(result, (str, bytes, dict)):
+                    s.set(rows=len(result))
+                return result
+        return wrapper
+    return decorate
+
+
+def _start_profiling():
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def dump():
+        profiler.disable()
+        profiler.dump_stats(PROFILE_FILE)
+    atexit.register(dump)
+
+
+if TRACE_MEMORY:
+    tracemalloc.start()
+
+if PROFILE_FILE:
+    _start_profiling()
+
+
+def summarize(trace_file=TRACE_FILE, run_id=None):
+    """Print per-span totals for one run of a trace file (the latest run by default)."""
+    with open(trace_file) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        print("Trace is empty.")
+        return
+    run_id = run_id or records[-1]["run_id"]
+    records = [r for r in records if r["run_id"] == run_id]
+
+    totals = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "rows": 0, "peak_bytes": 0})
+    for r in records:
+        t = totals[r["name"]]
+        t["calls"] += 1
+        t["seconds"] += r["seconds"]
+        t["rows"] += r.get("rows") or 0
+        t["peak_bytes"] = max(t["peak_bytes"], r.get("peak_bytes") or 0)
+
+    print(f"Run {run_id}")
+    print(f"{'span':<28} {'calls':>6} {'seconds':>9} {'rows':>10} {'peak MB':>8}")
+    for name, t in sorted(totals.items(), key=lambda kv: -kv[1]["seconds"]):
+        print(f"{name:<28} {t['calls']:>6} {t['seconds']:>9.3f} {t['rows']:>10} {t['peak_bytes'] / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    summarize(*sys.argv[1:3])
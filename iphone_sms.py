@@ -0,0 +1,208 @@
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tracemalloc
+import pandas as pd
+from pathlib import Path
+
+# SHA1 of "HomeDomain-Library/SMS/sms.db", the name sms.db gets inside an iTunes/Finder backup
+SMS_DB_BACKUP_NAME = "3d0d7e5fb2ce288813306e4d4636395e047a3d28"
+
+# Seconds between the Unix epoch and Apple's (2001-01-01 UTC)
+APPLE_EPOCH_OFFSET = 978307200
+
+# iOS 11+ stores message.date in nanoseconds since 2001, older versions in seconds.
+# Anything this large can only be nanoseconds.
+NANOSECOND_DATES = 100000000000
+
+MESSAGE_QUERY = f"""
+SELECT
+    m.ROWID AS _id,
+    h.id AS address,
+    CASE
+        WHEN m.date IS NULL OR m.date = 0 THEN NULL
+        WHEN m.date > {NANOSECOND_DATES} THEN m.date / 1000000000.0 + {APPLE_EPOCH_OFFSET}
+        ELSE m.date + {APPLE_EPOCH_OFFSET}
+    END AS date,
+    m.text AS body,
+    CASE WHEN m.is_from_me THEN 2 ELSE 1 END AS type,
+    {{attachments}} AS attachments
+FROM message m
+LEFT JOIN handle h ON h.ROWID = m.handle_id
+WHERE m.ROWID > ?
+ORDER BY m.ROWID
+"""
+
+ATTACHMENT_COUNT = "(SELECT COUNT(*) FROM message_attachment_join j WHERE j.message_id = m.ROWID)"
+
+# The subset of the modern sms.db layout that MESSAGE_QUERY reads, for synthetic databases
+SMS_DB_SCHEMA = """
+CREATE TABLE handle (ROWID INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL, service TEXT);
+CREATE TABLE message (ROWID INTEGER PRIMARY KEY AUTOINCREMENT, guid TEXT, text TEXT,
+                      handle_id INTEGER DEFAULT 0, date INTEGER, is_from_me INTEGER DEFAULT 0,
+                      cache_has_attachments INTEGER DEFAULT 0);
+CREATE TABLE message_attachment_join (message_id INTEGER, attachment_id INTEGER,
+                                      UNIQUE(message_id, attachment_id));
+"""
+
+
+def connect_readonly(db_path):
+    """Open an SQLite file read-only, so a backup is never modified or locked for writing."""
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+def find_sms_db(backup_path):
+    """Locate sms.db in a device backup: the well-known hashed name first, then any DB with a 'message' table."""
+    known = os.path.join(backup_path, SMS_DB_BACKUP_NAME[:2], SMS_DB_BACKUP_NAME)
+    if os.path.exists(known):
+        return known
+
+    for root, dirs, files in os.walk(backup_path):
+        for file in files:
+            file_path = os.path.join(root, file)
+            try:
+                conn = connect_readonly(file_path)
+                try:
+                    if "message" in _tables(conn):
+                        return file_path
+                finally:
+                    conn.close()
+            except sqlite3.DatabaseError:
+                continue
+    return None
+
+
+def iter_messages(db_path, since_rowid=0, chunksize=50000):
+    """Yield DataFrame chunks of messages with ROWID > since_rowid, in ROWID order.
+
+    The sender address comes from the handle table, attachments are counted in SQL and
+    Apple-epoch dates (seconds or nanoseconds) are converted to UTC timestamps per chunk.
+    """
+    conn = connect_readonly(db_path)
+    try:
+        attachments = ATTACHMENT_COUNT if "message_attachment_join" in _tables(conn) else "0"
+        query = MESSAGE_QUERY.format(attachments=attachments)
+        for chunk in pd.read_sql_query(query, conn, params=(since_rowid,), chunksize=chunksize):
+            chunk['date'] = pd.to_datetime(chunk['date'], unit='s', utc=True)
+            yield chunk
+    finally:
+        conn.close()
+
+
+def fetch_messages(db_path, since_rowid=0, chunksize=50000):
+    """All messages after since_rowid as one DataFrame (empty if there are none)."""
+    chunks = list(iter_messages(db_path, since_rowid, chunksize))
+    if not chunks:
+        return pd.DataFrame(columns=['_id', 'address', 'date', 'body', 'type', 'attachments'])
+    return pd.concat(chunks, ignore_index=True)
+
+
+def export_messages(db_path, filename, since_rowid=0, chunksize=50000):
+    """Stream messages after since_rowid into a CSV (appending on incremental pulls).
+
+    Returns (rows written, last ROWID seen) so the caller can pass the ROWID back next time.
+    """
+    rows, last_rowid = 0, since_rowid
+    append = since_rowid > 0 and os.path.exists(filename)
+    for chunk in iter_messages(db_path, since_rowid, chunksize):
+        chunk.to_csv(filename, mode='a' if append else 'w', header=not append, index=False, quoting=1)
+        append = True
+        rows += len(chunk)
+        last_rowid = int(chunk['_id'].iloc[-1])
+    return rows, last_rowid
+
+
+# -------------------------
+# Synthetic sms.db + benchmark
+# -------------------------
+def make_synthetic_sms_db(db_path, n_messages, n_handles=200, seed=0, bodies=None):
+    """Create an sms.db with the modern handle/message/message_attachment_join layout."""
+    rng = random.Random(seed)
+    bodies = bodies or [
+        "Rs.{amt} debited from A/c XX1234 to ZOMATO LTD on {day}. Avl Bal Rs.10000",
+        "Your A/c XX1234 is credited with Rs.{amt} from ACME PAYROLL on {day}",
+        "Sent Rs.{amt} from Kotak Bank AC X5678 to kamdhenu milk distributor on {day}",
+        "Your OTP is {amt}. Do not share it with anyone.",
+        "Flat 50% off this weekend only! Visit the nearest store.",
+    ]
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SMS_DB_SCHEMA)
+    conn.executemany("INSERT INTO handle (id, service) VALUES (?, 'SMS')",
+                     [(f"VM-BANK{i:03d}",) for i in range(n_handles)])
+
+    # ~3 years of messages ending now, in nanoseconds since 2001 (iOS 11+)
+    end = int(time.time()) - APPLE_EPOCH_OFFSET
+    start = end - 3 * 365 * 86400
+
+    def rows():
+        for i in range(n_messages):
+            seconds = start + (end - start) * i // max(n_messages, 1)
+            day = time.strftime("%d-%m-%y", time.gmtime(seconds + APPLE_EPOCH_OFFSET))
+            body = rng.choice(bodies).format(amt=rng.randint(10, 50000), day=day)
+            yield (f"guid-{i}", body, rng.randint(1, n_handles), seconds * 1000000000,
+                   int(rng.random() < 0.1), int(rng.random() < 0.02))
+
+    conn.executemany("INSERT INTO message (guid, text, handle_id, date, is_from_me, cache_has_attachments) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", rows())
+    conn.execute("INSERT INTO message_attachment_join SELECT ROWID, ROWID FROM message WHERE cache_has_attachments")
+    conn.commit()
+    conn.close()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(n_messages=1000000, db_path="synthetic_sms.db", chunksize=50000):
+    from datetime import datetime, timedelta
+
+    if not os.path.exists(db_path):
+        print(f"Building {db_path} with {n_messages:,} messages...")
+        make_synthetic_sms_db(db_path, n_messages)
+
+    def legacy():
+        # What parser.fetch_iphone_sms_auto did, minus the missing 'address' column and with
+        # the nanosecond scaling it lacked (timedelta(seconds=<ns>) overflows on iOS 11+ dates)
+        conn = sqlite3.connect(db_path)
+        df = pd.read_sql_query("SELECT ROWID as _id, handle_id, date, text as body FROM message", conn)
+        conn.close()
+        df['date'] = df['date'].apply(
+            lambda x: datetime(2001, 1, 1) + timedelta(seconds=x / 1e9 if x > NANOSECOND_DATES else x) if x else None
+        )
+        return len(df)
+
+    def streamed():
+        return sum(len(chunk) for chunk in iter_messages(db_path, chunksize=chunksize))
+
+    print(f"{'method':<22} {'rows':>10} {'seconds':>9} {'peak MB':>9}")
+    for name, fn in [("legacy read + apply", legacy), (f"SQL join, chunks={chunksize}", streamed)]:
+        rows, elapsed, peak = _measure(fn)
+        print(f"{name:<22} {rows:>10,} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+    last_rowid = n_messages - 1000
+    rows, elapsed, peak = _measure(lambda: len(fetch_messages(db_path, since_rowid=last_rowid)))
+    print(f"{'incremental (last 1k)':<22} {rows:>10,} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark iPhone sms.db extraction on a synthetic database.")
+    arg_parser.add_argument("-n", type=int, default=1000000, help="Messages in the synthetic sms.db")
+    arg_parser.add_argument("--db", default="synthetic_sms.db")
+    arg_parser.add_argument("--chunksize", type=int, default=50000)
+    args = arg_parser.parse_args()
+    benchmark(args.n, args.db, args.chunksize)
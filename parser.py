@@ -1,9 +1,11 @@
 import os
+import asyncio
 import re
 import subprocess
-import sqlite3
 import pandas as pd
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from iphone_sms import find_sms_db, fetch_messages
+from instrumentation import span, traced
 
 def parse_millis(ms):
     """Convert milliseconds to ISO datetime (UTC) for Android."""
@@ -20,64 +22,130 @@ def save_to_csv(df, filename="sms_raw_dump.csv"):
     print(f"\n✅ SMS data exported to '{filename}' ({len(df)} messages)\n")
     return df
 
+def _feed_line(block, line):
+    """Add one output line to the SMS being built in `block` (a list of lines).
+
+    Returns the finished previous SMS when `line` starts a new 'Row:'. Lines before the
+    first row (adb notices such as "No result found.") are dropped.
+    """
+    line = line.rstrip()
+    if line.startswith("Row:"):
+        finished = " ".join(block) if block else None
+        block[:] = [line]
+        return finished
+    if block:
+        block.append(line)
+    return None
+
+def iter_sms_blocks(lines):
+    """Group `adb shell content query` output lines into one string per SMS (bodies may span lines)."""
+    block = []
+    for line in lines:
+        finished = _feed_line(block, line)
+        if finished:
+            yield finished
+    if block:
+        yield " ".join(block)
+
+def parse_sms_block(block):
+    """Parse one 'Row: n _id=..., address=..., body=...' block into a dict."""
+    content = re.sub(r'^Row: \d+\s+', '', block)
+    sms_dict = {}
+
+    for key in ['_id', 'address', 'date', 'type', 'thread_id']:
+        m = re.search(rf'{key}=(.*?)(?:\s\w+=|$)', content, flags=re.DOTALL)
+        sms_dict[key] = m.group(1).strip() if m else None
+
+    m = re.search(r'body=(.*?)(?:\s(?:type|thread_id)=|$)', content, flags=re.DOTALL)
+    sms_dict['body'] = m.group(1).strip() if m else None
+    sms_dict['date'] = parse_millis(sms_dict['date'])
+    return sms_dict
+
 #ANDROID FETCH
 
-def fetch_android_sms():
-    """Fetch all SMS from Android using ADB."""
+# adb binary to run; override with the ADB environment variable
+ADB = os.environ.get("ADB", "adb")
+
+SMS_QUERY = [
+    'shell', 'content', 'query',
+    '--uri', 'content://sms',
+    '--projection', '_id,address,date,body,type,thread_id'
+]
+
+def list_adb_devices(adb=ADB):
+    """Serials of attached devices that are ready ('device' state; offline/unauthorized are skipped)."""
+    out = subprocess.check_output([adb, 'devices'], text=True)
+    serials = []
+    for line in out.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == 'device':
+            serials.append(parts[0])
+    return serials
+
+async def fetch_device_sms(serial, semaphore, store, adb=ADB):
+    """Run `adb -s <serial> shell content query` and parse its output into store[serial] as it streams in."""
+    rows = store.setdefault(serial, [])
+    async with semaphore:
+        with span("fetch.adb_device", device=serial) as s:
+            proc = await asyncio.create_subprocess_exec(
+                adb, '-s', serial, *SMS_QUERY,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=2**20
+            )
+
+            # Drain stderr alongside stdout so a chatty adb can't fill its pipe and stall
+            stderr_task = asyncio.create_task(proc.stderr.read())
+            block = []
+            async for raw_line in proc.stdout:
+                finished = _feed_line(block, raw_line.decode('utf-8', errors='replace'))
+                if finished:
+                    rows.append(dict(parse_sms_block(finished), device_id=serial))
+            if block:
+                rows.append(dict(parse_sms_block(" ".join(block)), device_id=serial))
+
+            stderr = await stderr_task
+            if await proc.wait() != 0:
+                print(f"⚠️ adb failed for device {serial}: {stderr.decode(errors='replace').strip()}")
+            s.set(rows=len(rows))
+    return rows
+
+async def fetch_devices_sms(serials, max_concurrency=4, adb=ADB):
+    """Fetch SMS from several devices concurrently (at most max_concurrency adb processes at once).
+
+    Returns one DataFrame with a device_id column identifying the phone each row came from.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    store = {}
+    await asyncio.gather(*(fetch_device_sms(serial, semaphore, store, adb) for serial in serials))
+
+    for serial in serials:
+        print(f"   {serial}: {len(store.get(serial, []))} messages")
+    return pd.DataFrame([row for serial in serials for row in store.get(serial, [])])
+
+@traced("fetch.android")
+def fetch_android_sms(save=True, max_concurrency=4):
+    """Fetch all SMS from every attached Android device using ADB."""
     print("📱 Detecting Android device via ADB...")
 
     try:
-        devices = subprocess.check_output(['adb', 'devices'], text=True)
-        if len(devices.strip().splitlines()) <= 1:
-            print("⚠️ No Android devices detected via ADB.")
-            return pd.DataFrame()
-
-        print("✅ Android device detected — fetching SMS...")
-        cmd = [
-            'adb', 'shell', 'content', 'query',
-            '--uri', 'content://sms',
-            '--projection', '_id,address,date,body,type,thread_id'
-        ]
-        out = subprocess.check_output(cmd, text=True)
-
-        sms_blocks = []
-        current_block = []
-
-        for line in out.splitlines():
-            line = line.rstrip()
-            if line.startswith("Row:"):
-                if current_block:
-                    sms_blocks.append(" ".join(current_block))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            sms_blocks.append(" ".join(current_block))
-
-        sms_list = []
-        for block in sms_blocks:
-            content = re.sub(r'^Row: \d+\s+', '', block)
-            sms_dict = {}
-
-            for key in ['_id', 'address', 'date', 'type', 'thread_id']:
-                m = re.search(rf'{key}=(.*?)(?:\s\w+=|$)', content, flags=re.DOTALL)
-                sms_dict[key] = m.group(1).strip() if m else None
-
-            m = re.search(r'body=(.*?)(?:\s(?:type|thread_id)=|$)', content, flags=re.DOTALL)
-            sms_dict['body'] = m.group(1).strip() if m else None
-            sms_dict['date'] = parse_millis(sms_dict['date'])
-            sms_list.append(sms_dict)
-
-        df_sms = pd.DataFrame(sms_list)
-        save_to_csv(df_sms, "sms_raw_dump_android.csv")
-        return df_sms
-
-    except subprocess.CalledProcessError:
+        serials = list_adb_devices()
+    except (OSError, subprocess.CalledProcessError):
         print("⚠️ Error: Could not fetch SMS via ADB. Is your Android device connected and USB debugging enabled?")
         return pd.DataFrame()
 
+    if not serials:
+        print("⚠️ No Android devices detected via ADB.")
+        return pd.DataFrame()
+
+    print(f"✅ {len(serials)} Android device(s) detected — fetching SMS...")
+    df_sms = asyncio.run(fetch_devices_sms(serials, max_concurrency))
+    if save:
+        save_to_csv(df_sms, "sms_raw_dump_android.csv")
+    return df_sms
+
 # IPHONE FETCH
 
-def fetch_iphone_sms_auto():
+@traced("fetch.iphone")
+def fetch_iphone_sms_auto(save=True):
     """Automatically detect iPhone backup and extract SMS from any DB containing 'message' table."""
     print("📱 Detecting iPhone backup...")
 
@@ -86,25 +154,7 @@ def fetch_iphone_sms_auto():
         print("⚠️ Backup folder not found. Create a local backup via Finder/iTunes first.")
         return pd.DataFrame()
 
-    sms_db_path = None
-
-    # Recursively check all files
-    for root, dirs, files in os.walk(base_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            try:
-                conn = sqlite3.connect(file_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = [row[0] for row in cursor.fetchall()]
-                conn.close()
-                if "message" in tables:
-                    sms_db_path = file_path
-                    break
-            except sqlite3.DatabaseError:
-                continue
-        if sms_db_path:
-            break
+    sms_db_path = find_sms_db(base_path)
 
     if not sms_db_path:
         print("⚠️ Could not locate SMS database file in backup.")
@@ -112,17 +162,12 @@ def fetch_iphone_sms_auto():
 
     print(f"✅ Found SMS database: {sms_db_path}")
 
-    # Extract SMS
+    # Extract SMS (read-only, joined with handle for the sender address)
     try:
-        conn = sqlite3.connect(sms_db_path)
-        df_sms = pd.read_sql_query("SELECT ROWID as _id, address, date, text as body FROM message", conn)
-        conn.close()
+        df_sms = fetch_messages(sms_db_path)
 
-        df_sms['date'] = df_sms['date'].apply(
-            lambda x: datetime(2001,1,1) + timedelta(seconds=x) if x else None
-        )
-
-        save_to_csv(df_sms, "sms_raw_dump_iphone.csv")
+        if save:
+            save_to_csv(df_sms, "sms_raw_dump_iphone.csv")
         return df_sms
 
     except Exception as e:
@@ -130,18 +175,20 @@ def fetch_iphone_sms_auto():
         return pd.DataFrame()
 
 
-def detect_device_and_fetch():
-    """Auto-detect connected device or fallback to iPhone backup."""
+def detect_device_and_fetch(save=True):
+    """Auto-detect connected device or fallback to iPhone backup.
+
+    Pass save=False to keep the dump in memory only (see pipeline.py).
+    """
     # Try Android first
     try:
-        devices = subprocess.check_output(['adb', 'devices'], text=True)
-        if len(devices.strip().splitlines()) > 1:
-            return fetch_android_sms()
+        if list_adb_devices():
+            return fetch_android_sms(save=save)
     except Exception:
         pass
 
     # Fallback to iPhone backup
-    return fetch_iphone_sms_auto()
+    return fetch_iphone_sms_auto(save=save)
 
 if __name__ == "__main__":
     df_sms = detect_device_and_fetch()
@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import math
+import time
+import random
+import argparse
+from collections import defaultdict, Counter
+
+# Tokens that extract_description picks up around the payee name ("Zomato Ltd", "Kamdhenu Milk Distributor On")
+NOISE_TOKENS = {
+    'on', 'ltd', 'limited', 'pvt', 'private', 'via', 'upi', 'ref', 'refno', 'ac', 'a', 'c',
+    'the', 'at', 'info', 'india', 'inr', 'rs', 'for', 'by', 'and', 'avl', 'bal', 'txn',
+}
+
+CACHE_FILE = "payee_cache.json"
+
+# Words shorter than this may only differ from their match by a dropped, doubled or swapped
+# letter, never a replaced one: "Zomatoo" and "Amazon Pya" are typos, but "Priya Naik" vs
+# "Priya Nair" or "Rahul Sharda" vs "Rahul Sharma" are different people
+LONG_TOKEN = 8
+
+
+def normalize_payee(raw):
+    """Lowercase, strip punctuation and leading/trailing noise tokens."""
+    tokens = re.sub(r'[^a-z0-9 ]+', ' ', str(raw).lower()).split()
+    while tokens and tokens[-1] in NOISE_TOKENS:
+        tokens.pop()
+    while tokens and tokens[0] in NOISE_TOKENS:
+        tokens.pop(0)
+    return " ".join(tokens)
+
+
+def _one_slip(a, b):
+    """True if b is a with one letter inserted, deleted or swapped with its neighbour."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) == 1:
+        return any(b[:i] + b[i + 1:] == a for i in range(len(b)))
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    return False
+
+
+def typo_compatible(name, other):
+    """Whether two normalized names can be spelling variants of each other.
+
+    Word by word (when both have the same number of words), every differing word under
+    LONG_TOKEN letters must be a single slip of its counterpart.
+    """
+    words, other_words = name.split(), other.split()
+    if len(words) != len(other_words):
+        return True
+    return all(a == b or min(len(a), len(b)) >= LONG_TOKEN or _one_slip(a, b)
+               for a, b in zip(words, other_words))
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class PayeeIndex:
+    """Maps raw payee strings to canonical names.
+
+    Candidates are blocked through an inverted index of character trigrams, so a lookup
+    only scores canonicals that share the query's rarest trigrams instead of every known
+    payee. The best candidate is accepted when its Dice coefficient on trigram sets reaches
+    `threshold` and the two names are typo_compatible(); otherwise the payee becomes a new
+    canonical. Raw -> canonical results are memoized and can be persisted with save()/load().
+    """
+
+    def __init__(self, threshold=0.75, max_candidates=10, seeds=()):
+        self.threshold = threshold
+        # Candidates (by shared blocking trigrams) that get an exact Dice score
+        self.max_candidates = max_candidates
+        self.canonicals = []
+        self.grams = []
+        self.by_name = {}
+        self.postings = defaultdict(list)
+        self.cache = {}
+        self.dirty = False
+        for name in seeds:
+            self._add(normalize_payee(name))
+
+    def _add(self, name):
+        if name in self.by_name:
+            return self.by_name[name]
+        idx = len(self.canonicals)
+        grams = trigrams(name)
+        self.canonicals.append(name)
+        self.grams.append(grams)
+        self.by_name[name] = idx
+        for g in grams:
+            self.postings[g].append(idx)
+        return idx
+
+    def _best_match(self, name):
+        grams = trigrams(name)
+        # Prefix filter: a canonical with Dice >= threshold must share at least
+        # min_shared trigrams, so it shares at least one of the rarest
+        # len(grams) - min_shared + 1 of them. Only those postings are scanned.
+        min_shared = math.ceil(self.threshold * len(grams) / (2 - self.threshold))
+        by_rarity = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        shared = Counter()
+        for g in by_rarity[:len(grams) - min_shared + 1]:
+            shared.update(self.postings.get(g, ()))
+
+        best, best_score = None, 0.0
+        for idx, _ in shared.most_common(self.max_candidates):
+            other = self.grams[idx]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score and typo_compatible(name, self.canonicals[idx]):
+                best, best_score = idx, score
+        return best, best_score
+
+    def canonicalize(self, raw):
+        """Canonical (title-cased) name for a raw payee string, or None for a missing payee."""
+        if raw is None or raw != raw or not str(raw).strip():
+            return None
+        if raw in self.cache:
+            return self.cache[raw]
+
+        name = normalize_payee(raw)
+        if not name:
+            canonical = str(raw).strip()
+        elif name in self.by_name:
+            canonical = name.title()
+        else:
+            idx, score = self._best_match(name)
+            if idx is None or score < self.threshold:
+                idx = self._add(name)
+            canonical = self.canonicals[idx].title()
+
+        self.cache[raw] = canonical
+        self.dirty = True
+        return canonical
+
+    def canonicalize_many(self, values):
+        """Canonicalize an iterable of raw payees, looking each distinct value up once."""
+        mapping = {raw: self.canonicalize(raw) for raw in set(values) if raw == raw}
+        return [mapping.get(raw) for raw in values]
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def save(self, filename=CACHE_FILE):
+        """Write the raw -> canonical cache if anything was added since it was loaded."""
+        if not self.dirty:
+            return
+        with open(filename, "w") as f:
+            json.dump(self.cache, f, indent=1, sort_keys=True)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, filename=CACHE_FILE, **kwargs):
+        index = cls(**kwargs)
+        if os.path.exists(filename):
+            with open(filename) as f:
+                cache = json.load(f)
+            for canonical in cache.values():
+                if canonical:
+                    index._add(normalize_payee(canonical))
+            index.cache = cache
+        return index
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def _synthetic_payees(n, seed=7):
+    """n distinct payee strings: ~n/5 merchants, each appearing with suffix/typo/case variants."""
+    rng = random.Random(seed)
+    syllables = ['ka', 'ma', 'dhe', 'nu', 'zo', 'to', 'swi', 'ggy', 'ra', 'jan', 'tra', 'vel',
+                 'ele', 'ctr', 'ics', 'mart', 'fo', 'ods', 'ph', 'arm', 'sh', 'ree', 'om', 'sai']
+    kinds = ['Milk Distributor', 'Stores', 'Enterprises', 'Traders', 'Medical', 'Foods', 'Travels', '']
+    suffixes = ['', ' Ltd', ' On', ' Pvt Ltd', ' Via Upi', ' Limited', ' India']
+
+    merchants = set()
+    while len(merchants) < max(1, n // 5):
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        merchants.add(f"{word} {rng.choice(kinds)}".strip())
+    merchants = list(merchants)
+
+    payees = set()
+    while len(payees) < n:
+        name = rng.choice(merchants) + rng.choice(suffixes)
+        if rng.random() < 0.3:
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:]
+        if rng.random() < 0.5:
+            name = name.upper()
+        payees.add(name + " " * rng.randint(0, 1))
+    return list(payees)
+
+
+def benchmark(n=100000):
+    payees = _synthetic_payees(n)
+    index = PayeeIndex()
+
+    t0 = time.perf_counter()
+    index.canonicalize_many(payees)
+    elapsed = time.perf_counter() - t0
+    print(f"{n:,} distinct payees -> {len(index.canonicals):,} canonical names "
+          f"in {elapsed:.2f}s ({elapsed / n * 1e6:.1f} µs/payee)")
+
+    t0 = time.perf_counter()
+    index.canonicalize_many(payees)
+    print(f"Memoized re-run: {time.perf_counter() - t0:.3f}s")
+
+    # Naive all-pairs scoring on a sample, extrapolated quadratically
+    sample = [trigrams(normalize_payee(p)) for p in payees[:1000]]
+    t0 = time.perf_counter()
+    for i, a in enumerate(sample):
+        for b in sample[i + 1:]:
+            2 * len(a & b) / (len(a) + len(b))
+    naive = (time.perf_counter() - t0) * (n / len(sample)) ** 2
+    print(f"Naive pairwise estimate for {n:,}: ~{naive:,.0f}s")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark payee canonicalization.")
+    arg_parser.add_argument("-n", type=int, default=100000)
+    args = arg_parser.parse_args()
+    benchmark(args.n)
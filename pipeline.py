@@ -0,0 +1,274 @@
+import os
+import glob
+import time
+import pickle
+import hashlib
+import tempfile
+import argparse
+import pandas as pd
+
+from parser import detect_device_and_fetch
+from Filter_Transactions import filter_transactions
+from FinalForm import extract_fields, categorize_transactions
+from finance_backend import FinanceBackend, source_fingerprint
+from summary_export import atomic_write
+from instrumentation import span
+
+# Stage order of the SMS -> summary flow. Each stage consumes the previous stage's output.
+STAGES = ["fetch", "filter", "extract", "categorize", "aggregate", "export"]
+
+# Stages whose output can be persisted and resumed from ("export" is itself the final write)
+CHECKPOINTABLE = STAGES[:-1]
+
+
+class Pipeline:
+    """Runs the fetch -> filter -> extract -> categorize -> aggregate -> export chain in memory.
+
+    DataFrames are handed from stage to stage directly; only the stages listed in
+    `checkpoints` are pickled to `checkpoint_dir`, and `run(resume=True)` restarts
+    after the latest checkpoint found there.
+    """
+
+    def __init__(self, checkpoints=("categorize",), checkpoint_dir=".pipeline_checkpoints",
+                 source=None, summary_file="financial_summary.json", alert_engine=None, payee_cache=None):
+        unknown = set(checkpoints) - set(CHECKPOINTABLE)
+        if unknown:
+            raise ValueError(f"Unknown checkpoint stage(s): {sorted(unknown)}. Choose from {CHECKPOINTABLE}")
+        self.checkpoints = set(checkpoints)
+        self.checkpoint_dir = checkpoint_dir
+        # Raw dump to start from instead of a connected device: a CSV path or a DataFrame
+        self.source = source
+        self.summary_file = summary_file
+        # Optional alert_engine.AlertEngine fed with every categorized transaction
+        self.alert_engine = alert_engine
+        # Optional payee_cache.json-style file to load/persist payee canonicalizations
+        self.payee_cache = payee_cache
+        self.exported = False
+        self.report = []
+        self._fingerprint = None
+
+    # -------------------------
+    # Stages
+    # -------------------------
+    def fetch(self, _):
+        if self.source is None:
+            return detect_device_and_fetch(save=False)
+        if isinstance(self.source, pd.DataFrame):
+            return self.source
+        return pd.read_csv(self.source)
+
+    def filter(self, df_sms):
+        return filter_transactions(df_sms)
+
+    def extract(self, df_transactions):
+        return extract_fields(df_transactions)
+
+    def categorize(self, df_extracted):
+        df_structured = categorize_transactions(df_extracted, cache_file=self.payee_cache)
+        if self.alert_engine is not None:
+            for event in self.alert_engine.add_many(df_structured.dropna(subset=['date'])):
+                print(f"🔔 {event['message']}")
+        return df_structured
+
+    def aggregate(self, df_structured):
+        return FinanceBackend(df=df_structured)
+
+    def export(self, backend):
+        self.exported = backend.save_summary_json(self.summary_file)
+        return self.summary_file
+
+    # -------------------------
+    # Checkpoints
+    # -------------------------
+    def _checkpoint_path(self, stage):
+        return os.path.join(self.checkpoint_dir, f"{STAGES.index(stage):02d}_{stage}.pkl")
+
+    def _source_fingerprint(self):
+        """What the checkpoints were computed from, so a resume never mixes up inputs."""
+        if self._fingerprint is None:
+            if self.source is None:
+                # A device can't be fingerprinted without fetching from it again
+                self._fingerprint = {"kind": "device"}
+            elif isinstance(self.source, pd.DataFrame):
+                hashed = pd.util.hash_pandas_object(self.source, index=True).values
+                self._fingerprint = {"kind": "dataframe", "sha256": hashlib.sha256(hashed.tobytes()).hexdigest()}
+            else:
+                self._fingerprint = {"kind": "csv", "sha256": source_fingerprint(self.source)["sha256"]}
+        return self._fingerprint
+
+    def _save_checkpoint(self, stage, output):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self._checkpoint_path(stage)
+        # Temp file + rename, so a crash mid-write never leaves a truncated checkpoint
+        data = pickle.dumps({"source": self._source_fingerprint(), "output": output},
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(path, data)
+        return len(data)
+
+    def _load_checkpoint(self):
+        """(stage, output) of the latest usable checkpoint, or (None, None) if there is none.
+
+        Unreadable checkpoints and ones computed from a different source are skipped in
+        favour of earlier ones.
+        """
+        for stage in reversed(CHECKPOINTABLE):
+            path = self._checkpoint_path(stage)
+            if not os.path.exists(path):
+                continue
+            try:
+                checkpoint = pd.read_pickle(path)
+            except Exception as e:
+                print(f"⚠️ Skipping unreadable '{stage}' checkpoint: {e}")
+                continue
+            if not isinstance(checkpoint, dict) or checkpoint.get("source") != self._source_fingerprint():
+                print(f"⚠️ Skipping '{stage}' checkpoint: it was computed from a different source")
+                continue
+            return stage, checkpoint["output"]
+        return None, None
+
+    def clear_checkpoints(self):
+        for path in glob.glob(os.path.join(self.checkpoint_dir, "*.pkl")):
+            os.remove(path)
+
+    # -------------------------
+    # Runner
+    # -------------------------
+    def run(self, resume=False, stop_after=None):
+        """Run the pipeline and return the last stage's output.
+
+        resume=True loads the latest checkpoint made from the same source and only runs the
+        stages after it; otherwise stale checkpoints from a previous run are cleared first.
+        """
+        self.report = []
+        self._fingerprint = None
+        output = None
+        start = 0
+
+        if resume:
+            stage, checkpoint = self._load_checkpoint()
+            if stage:
+                output = checkpoint
+                start = STAGES.index(stage) + 1
+                print(f"↩️ Resuming after '{stage}' checkpoint")
+            else:
+                print("↩️ No usable checkpoint, running the full pipeline")
+        else:
+            self.clear_checkpoints()
+
+        for stage in STAGES[start:]:
+            t0 = time.perf_counter()
+            with span(f"pipeline.{stage}") as s:
+                output = getattr(self, stage)(output)
+                s.set(rows=_row_count(output))
+            elapsed = time.perf_counter() - t0
+
+            bytes_written = 0
+            if stage in self.checkpoints:
+                bytes_written = self._save_checkpoint(stage, output)
+            elif stage == "export" and self.exported:
+                bytes_written = os.path.getsize(output)
+
+            self.report.append({
+                "stage": stage,
+                "seconds": elapsed,
+                "rows": _row_count(output),
+                "bytes_written": bytes_written,
+            })
+
+            if stage == stop_after:
+                break
+
+        return output
+
+    def print_report(self, title="In-memory pipeline"):
+        print_report(self.report, title)
+
+
+def _row_count(output):
+    if isinstance(output, pd.DataFrame):
+        return len(output)
+    if isinstance(output, FinanceBackend):
+        return len(output.df)
+    return None
+
+
+def print_report(report, title):
+    total_time = sum(r["seconds"] for r in report)
+    total_bytes = sum(r["bytes_written"] for r in report)
+    print(f"\n{title}")
+    print("-" * 60)
+    for r in report:
+        rows = "" if r["rows"] is None else r["rows"]
+        print(f"{r['stage']:<12} {r['seconds']:>9.3f}s {rows:>10} rows {r['bytes_written']:>12,} bytes")
+    print("-" * 60)
+    print(f"{'total':<12} {total_time:>9.3f}s {'':>15} {total_bytes:>12,} bytes")
+
+
+def run_csv_chain(df_sms, workdir):
+    """Replay the original script chain (parser -> Filter_Transactions -> FinalForm -> FinanceBackend)
+    with its intermediate CSV writes/reads, for comparison against Pipeline."""
+    report = []
+
+    def timed(stage, fn, path=None):
+        t0 = time.perf_counter()
+        out = fn()
+        report.append({
+            "stage": stage,
+            "seconds": time.perf_counter() - t0,
+            "rows": _row_count(out),
+            "bytes_written": os.path.getsize(path) if path else 0,
+        })
+        return out
+
+    raw_csv = os.path.join(workdir, "sms_raw_dump.csv")
+    txn_csv = os.path.join(workdir, "sms_transactions.csv")
+    structured_csv = os.path.join(workdir, "structured_transactions.csv")
+    summary_json = os.path.join(workdir, "financial_summary.json")
+
+    timed("fetch", lambda: df_sms.to_csv(raw_csv, index=False, quoting=1) or df_sms, raw_csv)
+
+    def filter_stage():
+        df = filter_transactions(pd.read_csv(raw_csv))
+        df.to_csv(txn_csv, index=False)
+        return df
+    timed("filter", filter_stage, txn_csv)
+
+    def extract_stage():
+        df = categorize_transactions(extract_fields(pd.read_csv(txn_csv)))
+        df.to_csv(structured_csv, index=False, quoting=1)
+        return df
+    timed("extract+cat", extract_stage, structured_csv)
+
+    backend = timed("aggregate", lambda: FinanceBackend(csv_file=structured_csv))
+    timed("export", lambda: backend.save_summary_json(summary_json), summary_json)
+
+    return report
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run the SMS -> financial summary pipeline in memory.")
+    arg_parser.add_argument("--source", help="Raw SMS dump CSV to use instead of fetching from a device")
+    arg_parser.add_argument("--checkpoint", action="append", choices=CHECKPOINTABLE,
+                            help="Stage to persist (repeatable). Default: categorize")
+    arg_parser.add_argument("--checkpoint-dir", default=".pipeline_checkpoints")
+    arg_parser.add_argument("--resume", action="store_true", help="Resume from the latest checkpoint")
+    arg_parser.add_argument("--output", default="financial_summary.json")
+    arg_parser.add_argument("--payee-cache", help="Load and update payee canonicalizations in this file")
+    arg_parser.add_argument("--compare", action="store_true",
+                            help="Also run the original CSV script chain on the same input and report both")
+    args = arg_parser.parse_args()
+
+    pipeline = Pipeline(
+        checkpoints=args.checkpoint or ("categorize",),
+        checkpoint_dir=args.checkpoint_dir,
+        source=args.source,
+        summary_file=args.output,
+        payee_cache=args.payee_cache,
+    )
+    pipeline.run(resume=args.resume)
+    pipeline.print_report()
+
+    if args.compare:
+        df_sms = pipeline.fetch(None)
+        with tempfile.TemporaryDirectory() as workdir:
+            print_report(run_csv_chain(df_sms, workdir), "Original CSV script chain")
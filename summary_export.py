@@ -0,0 +1,230 @@
+import os
+import io
+import gzip
+import json
+import time
+import hashlib
+import tempfile
+import argparse
+
+# Output formats for financial_summary.json
+#   pretty  - indent=4, what SCS.py / FinanceBackend always wrote (default, readable by MyApp as-is)
+#   compact - minified JSON, no whitespace
+#   gzip    - minified JSON, gzip-compressed (deterministic, so hashes stay stable)
+FORMATS = ("pretty", "compact", "gzip")
+
+# Row keys used to diff the summary tables when building a delta document
+ROW_KEYS = {
+    "monthly_summary": "Month",
+    "weekly_summary": "week_start",
+}
+
+
+def summary_document(backend):
+    """Build the financial_summary.json document from a FinanceBackend without touching its state."""
+    summary = backend.summary.copy()
+    summary['Month'] = summary['Month'].astype(str)
+
+    weekly = backend.weekly_current
+    if not weekly.empty:
+        weekly = weekly.copy()
+        weekly['week_start'] = weekly['week_start'].astype(str)
+        weekly['week_end'] = weekly['week_end'].astype(str)
+
+    return {
+        "monthly_summary": summary.to_dict(orient='records'),
+        "weekly_summary": weekly.to_dict(orient='records') if not weekly.empty else [],
+        "weekly_alerts": list(backend.weekly_alerts),
+    }
+
+
+def serialize(doc, fmt="pretty"):
+    """Serialize a summary document to bytes in one of FORMATS."""
+    if fmt == "pretty":
+        return json.dumps(doc, indent=4).encode("utf-8")
+    if fmt == "compact":
+        return json.dumps(doc, separators=(",", ":")).encode("utf-8")
+    if fmt == "gzip":
+        buf = io.BytesIO()
+        # mtime=0 keeps the gzip header constant so identical content hashes identically
+        with gzip.GzipFile(fileobj=buf, mode="wb", mtime=0) as gz:
+            gz.write(serialize(doc, "compact"))
+        return buf.getvalue()
+    raise ValueError(f"Unknown format '{fmt}'. Choose from {FORMATS}")
+
+
+def load_summary(filename):
+    """Read a summary written in any of FORMATS (gzip is detected from its magic bytes)."""
+    with open(filename, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hash_file(filename):
+    return filename + ".sha256"
+
+
+def _read_hash(filename):
+    """(hash of the summary currently on disk or None, whether the sidecar vouched for it).
+
+    The sidecar records the size and mtime the hash was taken at; if the file has changed
+    since (a git checkout, a manual edit), it is re-hashed instead of trusting the sidecar.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None, False
+    try:
+        with open(_hash_file(filename)) as f:
+            fields = f.read().split()
+        if len(fields) == 3 and fields[1:] == [str(stat.st_size), str(stat.st_mtime_ns)]:
+            return fields[0], True
+    except FileNotFoundError:
+        pass
+    with open(filename, "rb") as f:
+        return content_hash(f.read()), False
+
+
+def _write_hash(filename, digest):
+    stat = os.stat(filename)
+    atomic_write(_hash_file(filename), f"{digest} {stat.st_size} {stat.st_mtime_ns}\n".encode("utf-8"))
+
+
+def atomic_write(filename, data):
+    """Write bytes to a temp file next to `filename` and rename it into place."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(filename))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_delta(old_doc, new_doc, base_hash=None, new_hash=None):
+    """Describe how to turn old_doc into new_doc: upserted/removed months and weeks,
+    plus the alert list only when it changed. Apply with applySummaryDelta in MyApp."""
+    delta = {"base_hash": base_hash, "hash": new_hash}
+
+    for table, key in ROW_KEYS.items():
+        old_rows = {row[key]: row for row in old_doc.get(table, [])}
+        new_rows = {row[key]: row for row in new_doc.get(table, [])}
+        delta[table] = {
+            "upsert": [row for k, row in new_rows.items() if old_rows.get(k) != row],
+            "remove": [k for k in old_rows if k not in new_rows],
+        }
+
+    if old_doc.get("weekly_alerts") != new_doc.get("weekly_alerts"):
+        delta["weekly_alerts"] = new_doc.get("weekly_alerts", [])
+
+    return delta
+
+
+def export_summary(doc, filename="financial_summary.json", fmt="pretty", delta_file=None):
+    """Atomically write `doc` to `filename`, skipping the write if its content hash is unchanged.
+
+    When `delta_file` is given and a previous summary exists, a delta document against it is
+    written there as well. Returns True if the summary was (re)written.
+    """
+    data = serialize(doc, fmt)
+    new_hash = content_hash(data)
+    old_hash, sidecar_ok = _read_hash(filename)
+
+    if new_hash == old_hash:
+        if not sidecar_ok:
+            _write_hash(filename, new_hash)
+        return False
+
+    if delta_file and old_hash is not None:
+        delta = build_delta(load_summary(filename), doc, old_hash, new_hash)
+        atomic_write(delta_file, serialize(delta, "compact"))
+
+    atomic_write(filename, data)
+    _write_hash(filename, new_hash)
+    return True
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def _synthetic_document(years):
+    """Multi-year summary shaped like FinanceBackend's output (one weekly row per week)."""
+    import random
+    from datetime import date, timedelta
+
+    rng = random.Random(42)
+    start = date(2025 - years, 1, 1)
+    months = []
+    for i in range(years * 12):
+        income = rng.uniform(20000, 90000)
+        expense = rng.uniform(5000, 80000)
+        months.append({
+            "Month": f"{start.year + i // 12}-{i % 12 + 1:02d}",
+            "Income": income,
+            "Expense": expense,
+            "Spending Ratio (%)": expense / income * 100,
+        })
+
+    weeks, cumulative = [], 0.0
+    for i in range(years * 52):
+        week_start = start + timedelta(weeks=i)
+        weekly = rng.uniform(1000, 20000)
+        cumulative += weekly
+        weeks.append({
+            "week_start": str(week_start),
+            "week_end": str(week_start + timedelta(days=6)),
+            "Weekly Expense": weekly,
+            "Cumulative Expense": cumulative,
+            "Remaining Budget": 50000 - cumulative,
+            "Estimated Budget": 50000.0,
+            "First Week Income": 60000.0,
+        })
+
+    alerts = [f"Week {w['week_start']} - {w['week_end']}: Weekly expenditure ₹{w['Weekly Expense']:.2f}" for w in weeks]
+    return {"monthly_summary": months, "weekly_summary": weeks, "weekly_alerts": alerts}
+
+
+def benchmark(years=10, repeat=20):
+    doc = _synthetic_document(years)
+    print(f"Synthetic summary: {years} years, {len(doc['monthly_summary'])} months, {len(doc['weekly_summary'])} weeks\n")
+    print(f"{'format':<10} {'ms/serialize':>14} {'bytes':>12}")
+    for fmt in FORMATS:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            data = serialize(doc, fmt)
+        elapsed = (time.perf_counter() - t0) / repeat * 1000
+        print(f"{fmt:<10} {elapsed:>14.2f} {len(data):>12,}")
+
+    # One changed month plus one new week, as after a typical new-transaction refresh
+    updated = json.loads(json.dumps(doc))
+    updated["monthly_summary"][-1]["Expense"] += 500
+    updated["weekly_summary"].append(dict(updated["weekly_summary"][-1], week_start="2099-01-05"))
+    delta = serialize(build_delta(doc, updated), "compact")
+    print(f"{'delta':<10} {'':>14} {len(delta):>12,}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "financial_summary.json")
+        export_summary(doc, path)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            export_summary(doc, path)
+        print(f"\nUnchanged re-export (skipped): {(time.perf_counter() - t0) / repeat * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark financial summary serialization formats.")
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+    benchmark(args.years, args.repeat)
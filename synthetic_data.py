@@ -0,0 +1,205 @@
+import os
+import time
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+
+from iphone_sms import SMS_DB_SCHEMA, APPLE_EPOCH_OFFSET
+
+# Sender IDs and SMS templates in the shapes the big Indian banks actually use
+BANKS = {
+    "VM-HDFCBK": [
+        ("debit", "Sent Rs.{amt} From HDFC Bank A/C *{acct} To {payee} On {day} Ref {ref} Not You? Call 18002586161/SMS BLOCK UPI to 7308080808"),
+        ("credit", "Rs.{amt} credited to HDFC Bank A/c XX{acct} on {day} from {payee} (UPI Ref No {ref})"),
+    ],
+    "AD-SBIUPI": [
+        ("debit", "Dear UPI user A/C X{acct} debited by {amt} on date {day} trf to {payee} Refno {ref}. If not u? call 1800111109. -SBI"),
+        ("credit", "Dear SBI User, your A/c X{acct}-credited by Rs.{amt} on {day} transfer from {payee} Ref No {ref} -SBI"),
+    ],
+    "JM-ICICIB": [
+        ("debit", "ICICI Bank Acct XX{acct} debited for Rs {amt} on {day}; {payee} credited. UPI:{ref}. Call 18002662 for dispute."),
+        ("credit", "Dear Customer, Acct XX{acct} is credited with Rs {amt} on {day} from {payee}. UPI:{ref}-ICICI Bank."),
+    ],
+    "VK-KOTAKB": [
+        ("debit", "Sent Rs.{amt} from Kotak Bank AC X{acct} to {payee} on {day}.UPI Ref {ref}. Not you, https://kotak.com/KBANKT/Fraud"),
+        ("credit", "Received Rs.{amt} in your Kotak Bank AC X{acct} from {payee} on {day}.UPI Ref:{ref}."),
+    ],
+    "AX-AXISBK": [
+        ("debit", "INR {amt} debited from A/c no. XX{acct} on {day} to {payee}. UPI/P2M/{ref}. Not you? SMS BLOCKUPI to 919951860002 - Axis Bank"),
+        ("credit", "INR {amt} credited to A/c no. XX{acct} on {day} by {payee}. UPI/P2A/{ref}. - Axis Bank"),
+    ],
+}
+
+NOISE = {
+    "VM-OFFERS": "Flat {amt}% off on your next order! Use code SAVE{ref} before {day}. T&C apply.",
+    "AD-OTPSMS": "{ref} is your OTP for login. Do not share it with anyone. Valid till {day}.",
+    "JD-JIOINF": "Dear customer, 75% of your daily data quota is used as on {day}. Recharge for Rs.{amt} now.",
+}
+
+MERCHANTS = [
+    "ZOMATO LTD", "SWIGGY", "AMAZON PAY INDIA", "FLIPKART INTERNET", "IRCTC", "UBER INDIA", "OLA CABS",
+    "NETFLIX COM", "SPOTIFY INDIA", "KAMDHENU MILK DISTRIBUTOR", "INOX LEISURE", "BESCOM ELECTRICITY",
+    "JIO RECHARGE", "BHARAT PETROLEUM FUEL", "DMART READY", "APOLLO PHARMACY", "VIJAYANAND TRAVELS",
+]
+PEOPLE = [
+    "RAHUL SHARMA", "PRIYA NAIR", "ANKIT VERMA", "SNEHA KULKARNI", "ARJUN REDDY", "MEERA IYER",
+    "ROHAN GUPTA", "KAVYA MENON", "VIKRAM SINGH", "NEHA JOSHI",
+]
+PAYERS = ["ACME TECHNOLOGIES PAYROLL", "FREELANCE CLIENT", "MOM", "DAD", "SPLITWISE SETTLEMENT"] + PEOPLE
+
+# One conversation thread per sender, as on a real phone
+THREAD_IDS = {sender: i + 1 for i, sender in enumerate(list(BANKS) + list(NOISE))}
+
+COLUMNS = ['_id', 'address', 'date', 'body', 'type', 'thread_id']
+
+
+def iter_synthetic_sms(n, seed=0, chunk_size=250000, years=2, end=None,
+                       debit_share=0.55, credit_share=0.15):
+    """Yield DataFrames of synthetic raw SMS in parser.py's raw dump layout, chunk by chunk.
+
+    Dates are spread evenly over `years` ending at `end` (today by default) with some jitter;
+    the rest of every row is drawn from a generator seeded by (seed, chunk index), so the same
+    arguments always produce the same messages.
+    """
+    end = pd.Timestamp(end or pd.Timestamp.now(tz='UTC').normalize() + pd.Timedelta(days=1))
+    if end.tzinfo is None:
+        end = end.tz_localize('UTC')
+    end_ms = end.value // 10**6
+    span_ms = int(years * 365 * 86400 * 1000)
+
+    banks = list(BANKS)
+    noise = list(NOISE)
+    for chunk_index, first in enumerate(range(0, n, chunk_size)):
+        rng = np.random.default_rng([seed, chunk_index])
+        ids = np.arange(first, min(first + chunk_size, n))
+        size = len(ids)
+
+        # Evenly spaced timestamps plus up to ~3h of jitter, oldest first
+        date_ms = end_ms - span_ms + (ids * span_ms) // max(n, 1) + rng.integers(0, 3 * 3600 * 1000, size)
+        date_ms = np.minimum(date_ms, end_ms - 1)
+
+        roll = rng.random(size)
+        kind = np.where(roll < debit_share, 'debit', np.where(roll < debit_share + credit_share, 'credit', 'noise'))
+        bank = rng.integers(0, len(banks), size)
+        noise_sender = rng.integers(0, len(noise), size)
+        debit_amt = np.round(rng.lognormal(6.0, 1.1, size), 2)
+        credit_amt = np.round(rng.lognormal(8.5, 1.0, size), 0)
+        merchant = rng.integers(0, len(MERCHANTS), size)
+        person = rng.integers(0, len(PEOPLE), size)
+        to_person = rng.random(size) < 0.3
+        payer = rng.integers(0, len(PAYERS), size)
+        acct = rng.integers(1000, 9999, size)
+        ref = rng.integers(10**11, 10**12, size)
+        days = pd.to_datetime(date_ms, unit='ms', utc=True).strftime('%d-%m-%y')
+
+        addresses, bodies = [], []
+        for i in range(size):
+            if kind[i] == 'noise':
+                sender = noise[noise_sender[i]]
+                body = NOISE[sender].format(amt=int(debit_amt[i]) % 90 + 10, ref=ref[i] % 10**6, day=days[i])
+            else:
+                sender = banks[bank[i]]
+                if kind[i] == 'debit':
+                    template = BANKS[sender][0][1]
+                    payee = PEOPLE[person[i]] if to_person[i] else MERCHANTS[merchant[i]]
+                    amt = f"{debit_amt[i]:.2f}"
+                else:
+                    template = BANKS[sender][1][1]
+                    payee = PAYERS[payer[i]]
+                    amt = f"{credit_amt[i]:.2f}"
+                body = template.format(amt=amt, acct=acct[i], payee=payee, day=days[i], ref=ref[i])
+            addresses.append(sender)
+            bodies.append(body)
+
+        yield pd.DataFrame({
+            '_id': ids + 1,
+            'address': addresses,
+            'date': pd.to_datetime(date_ms, unit='ms', utc=True),
+            'body': bodies,
+            # Bank alerts all land in the inbox (Android type 1)
+            'type': 1,
+            'thread_id': [THREAD_IDS[a] for a in addresses],
+        }, columns=COLUMNS)
+
+
+def generate_sms(n, seed=0, **kwargs):
+    """All n synthetic messages as one DataFrame."""
+    return pd.concat(iter_synthetic_sms(n, seed, **kwargs), ignore_index=True)
+
+
+# -------------------------
+# Writers
+# -------------------------
+def write_csv(chunks, filename):
+    """Raw dump CSV, as parser.save_to_csv writes it."""
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(filename, mode='w' if i == 0 else 'a', header=(i == 0), index=False, quoting=1)
+
+
+def write_adb_dump(chunks, filename):
+    """Text in the format of `adb shell content query --uri content://sms` (what parser.py parses)."""
+    row = 0
+    with open(filename, "w") as f:
+        for chunk in chunks:
+            date_ms = chunk['date'].dt.as_unit('ms').astype('int64')
+            for _id, address, ms, body, msg_type, thread_id in zip(
+                    chunk['_id'], chunk['address'], date_ms, chunk['body'], chunk['type'], chunk['thread_id']):
+                f.write(f"Row: {row} _id={_id}, address={address}, date={ms}, body={body}, "
+                        f"type={msg_type}, thread_id={thread_id}\n")
+                row += 1
+
+
+def write_sms_db(chunks, filename):
+    """iPhone-style sms.db (handle/message tables) readable by iphone_sms.py."""
+    if os.path.exists(filename):
+        os.remove(filename)
+    conn = sqlite3.connect(filename)
+    conn.executescript(SMS_DB_SCHEMA)
+    handles = {}
+    for chunk in chunks:
+        for address in chunk['address'].unique():
+            if address not in handles:
+                cur = conn.execute("INSERT INTO handle (id, service) VALUES (?, 'SMS')", (address,))
+                handles[address] = cur.lastrowid
+        apple_ns = (chunk['date'].dt.as_unit('s').astype('int64') - APPLE_EPOCH_OFFSET) * 10**9
+        conn.executemany(
+            "INSERT INTO message (ROWID, guid, text, handle_id, date, is_from_me) VALUES (?, ?, ?, ?, ?, ?)",
+            zip(chunk['_id'].tolist(), (f"guid-{i}" for i in chunk['_id']), chunk['body'].tolist(),
+                chunk['address'].map(handles).tolist(), apple_ns.tolist(), (chunk['type'] == 2).astype(int).tolist()),
+        )
+    conn.commit()
+    conn.close()
+
+
+WRITERS = {
+    "csv": ("sms_raw_dump.csv", write_csv),
+    "adb": ("adb_content_query.txt", write_adb_dump),
+    "sqlite": ("sms.db", write_sms_db),
+}
+
+
+def generate_files(n, out_dir, formats=("csv", "adb", "sqlite"), seed=0, chunk_size=250000, end=None):
+    """Write the synthetic dump in each requested format; returns {format: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for fmt in formats:
+        name, writer = WRITERS[fmt]
+        paths[fmt] = os.path.join(out_dir, name)
+        writer(iter_synthetic_sms(n, seed, chunk_size=chunk_size, end=end), paths[fmt])
+    return paths
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate seeded synthetic multi-bank SMS dumps.")
+    arg_parser.add_argument("-n", type=int, default=10000, help="Number of messages (10k .. 10M)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--out-dir", default="synthetic")
+    arg_parser.add_argument("--format", nargs="+", choices=list(WRITERS), default=list(WRITERS))
+    arg_parser.add_argument("--end", help="Last day covered (YYYY-MM-DD); defaults to today")
+    args = arg_parser.parse_args()
+
+    t0 = time.perf_counter()
+    for fmt, path in generate_files(args.n, args.out_dir, args.format, args.seed, end=args.end).items():
+        print(f"✅ {fmt:<7} {path} ({os.path.getsize(path):,} bytes)")
+    print(f"Generated {args.n:,} messages in {time.perf_counter() - t0:.1f}s")